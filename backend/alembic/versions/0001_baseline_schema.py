@@ -0,0 +1,82 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases bootstrapped by Base.metadata.create_all already have these
+    # tables, so only create what is missing.
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("sources"):
+        op.create_table(
+            "sources",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False, unique=True),
+            sa.Column("url", sa.String()),
+            sa.Column("source_type", sa.String()),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("last_fetched", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("fetch_count", sa.Integer()),
+        )
+
+    if not inspector.has_table("news_items"):
+        op.create_table(
+            "news_items",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("source_id", sa.Integer(), sa.ForeignKey("sources.id"), nullable=True),
+            sa.Column("title", sa.Text(), nullable=False),
+            sa.Column("url", sa.Text(), nullable=False, unique=True),
+            sa.Column("published_at", sa.DateTime(timezone=True)),
+            sa.Column("summary", sa.Text()),
+            sa.Column("impact_score", sa.Integer()),
+            sa.Column("sentiment", sa.String()),
+            sa.Column("category_cluster", sa.String()),
+            sa.Column("embedding", Vector(384)),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("view_count", sa.Integer()),
+            sa.Column("broadcast_count", sa.Integer()),
+        )
+        op.create_index("ix_news_items_id", "news_items", ["id"])
+
+    if not inspector.has_table("favorites"):
+        op.create_table(
+            "favorites",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("news_item_id", sa.Integer(), sa.ForeignKey("news_items.id")),
+            sa.Column("user_id", sa.Integer()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if not inspector.has_table("broadcast_logs"):
+        op.create_table(
+            "broadcast_logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("news_item_id", sa.Integer(), sa.ForeignKey("news_items.id")),
+            sa.Column("platform", sa.String(), nullable=False),
+            sa.Column("status", sa.String()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("broadcast_logs")
+    op.drop_table("favorites")
+    op.drop_table("news_items")
+    op.drop_table("sources")
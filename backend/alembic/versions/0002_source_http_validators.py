@@ -0,0 +1,26 @@
+"""store feed ETag / Last-Modified on sources
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE sources ADD COLUMN IF NOT EXISTS etag VARCHAR")
+    op.execute("ALTER TABLE sources ADD COLUMN IF NOT EXISTS last_modified VARCHAR")
+
+
+def downgrade() -> None:
+    op.drop_column("sources", "last_modified")
+    op.drop_column("sources", "etag")
@@ -0,0 +1,31 @@
+"""persistent cache for LLM analysis results
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("analysis_cache"):
+        op.create_table(
+            "analysis_cache",
+            sa.Column("key", sa.String(64), primary_key=True),
+            sa.Column("model_id", sa.String(), nullable=False),
+            sa.Column("result", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("analysis_cache")
@@ -0,0 +1,41 @@
+"""feed-order, category and HNSW vector indexes on news_items
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; keeps the table writable
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_feed_order "
+            "ON news_items (impact_score DESC, published_at DESC NULLS LAST, id DESC)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_category_cluster "
+            "ON news_items (category_cluster)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_embedding_hnsw "
+            "ON news_items USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_embedding_hnsw")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_category_cluster")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_feed_order")
@@ -0,0 +1,121 @@
+"""canonical url and title fingerprint dedup keys on news_items
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+# --------------------------------------------------
+# Normalization as of this revision. Frozen copy of
+# app.services.normalization so later changes there
+# don't alter what this backfill writes.
+# --------------------------------------------------
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref_src", "cmpid", "ncid", "spm", "_hsenc", "_hsmi", "outputtype",
+}
+TRACKING_PREFIXES = ("utm_", "at_")
+AMP_HOST_PREFIXES = ("amp.", "m.")
+AMP_PATH_SUFFIXES = ("/amp", ".amp")
+MIN_FINGERPRINT_WORDS = 4
+
+
+def canonicalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.",) + AMP_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path)
+    for suffix in AMP_PATH_SUFFIXES:
+        if path.lower().endswith(suffix) or path.lower().endswith(suffix + "/"):
+            path = path.rstrip("/")[: -len(suffix)]
+    path = path.rstrip("/")
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+        and not (key.lower() == "amp")
+    ))
+
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def title_fingerprint(title: str) -> Optional[str]:
+    text = unicodedata.normalize("NFKD", title)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    words = re.findall(r"[a-z0-9]+", text.lower())
+
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+
+    return hashlib.sha256(" ".join(words).encode()).hexdigest()[:32]
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE news_items ADD COLUMN IF NOT EXISTS canonical_url text")
+    op.execute(
+        "ALTER TABLE news_items ADD COLUMN IF NOT EXISTS title_fingerprint varchar(32)"
+    )
+
+    # Backfill existing rows so they take part in dedup
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, url, title FROM news_items WHERE canonical_url IS NULL")
+    ).all()
+    if rows:
+        bind.execute(
+            sa.text(
+                "UPDATE news_items SET canonical_url = :canonical_url, "
+                "title_fingerprint = :title_fingerprint WHERE id = :id"
+            ),
+            [
+                {
+                    "id": row.id,
+                    "canonical_url": canonicalize_url(row.url),
+                    "title_fingerprint": title_fingerprint(row.title),
+                }
+                for row in rows
+            ],
+        )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_canonical_url "
+            "ON news_items (canonical_url)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_title_fingerprint "
+            "ON news_items (title_fingerprint, created_at)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_title_fingerprint")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_canonical_url")
+    op.drop_column("news_items", "title_fingerprint")
+    op.drop_column("news_items", "canonical_url")
@@ -0,0 +1,32 @@
+"""adaptive fetch schedule columns on sources
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE sources ADD COLUMN IF NOT EXISTS fetch_interval_minutes INTEGER")
+    op.execute("ALTER TABLE sources ADD COLUMN IF NOT EXISTS next_fetch_at TIMESTAMPTZ")
+    op.execute("ALTER TABLE sources ADD COLUMN IF NOT EXISTS new_item_rate DOUBLE PRECISION")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_sources_next_fetch_at ON sources (next_fetch_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_sources_next_fetch_at")
+    op.drop_column("sources", "new_item_rate")
+    op.drop_column("sources", "next_fetch_at")
+    op.drop_column("sources", "fetch_interval_minutes")
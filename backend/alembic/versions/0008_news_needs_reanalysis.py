@@ -0,0 +1,34 @@
+"""needs_reanalysis flag for fallback-analyzed news items
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE news_items ADD COLUMN IF NOT EXISTS needs_reanalysis "
+        "BOOLEAN NOT NULL DEFAULT false"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_needs_reanalysis "
+            "ON news_items (created_at) WHERE needs_reanalysis"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_needs_reanalysis")
+    op.drop_column("news_items", "needs_reanalysis")
@@ -0,0 +1,50 @@
+"""published_at NOT NULL and plain DESC feed-order index
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE news_items SET published_at = coalesce(created_at, now()) "
+        "WHERE published_at IS NULL"
+    )
+    op.execute("ALTER TABLE news_items ALTER COLUMN published_at SET DEFAULT now()")
+    op.execute("ALTER TABLE news_items ALTER COLUMN published_at SET NOT NULL")
+
+    # Rebuild under a new name, then swap, so the feed is never unindexed
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_feed_order_new "
+            "ON news_items (impact_score DESC, published_at DESC, id DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_feed_order")
+    op.execute(
+        "ALTER INDEX ix_news_items_feed_order_new RENAME TO ix_news_items_feed_order"
+    )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_items_feed_order_old "
+            "ON news_items (impact_score DESC, published_at DESC NULLS LAST, id DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_news_items_feed_order")
+    op.execute(
+        "ALTER INDEX ix_news_items_feed_order_old RENAME TO ix_news_items_feed_order"
+    )
+    op.execute("ALTER TABLE news_items ALTER COLUMN published_at DROP NOT NULL")
+    op.execute("ALTER TABLE news_items ALTER COLUMN published_at DROP DEFAULT")
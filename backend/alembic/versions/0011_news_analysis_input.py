@@ -0,0 +1,24 @@
+"""original analysis input on news_items for re-analysis
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE news_items ADD COLUMN IF NOT EXISTS analysis_input text")
+
+
+def downgrade() -> None:
+    op.drop_column("news_items", "analysis_input")
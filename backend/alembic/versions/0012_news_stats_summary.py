@@ -0,0 +1,44 @@
+"""news_stats summary table for dashboard counters
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("news_stats"):
+        op.create_table(
+            "news_stats",
+            sa.Column("source_id", sa.Integer(), primary_key=True),
+            sa.Column("category_cluster", sa.String(), primary_key=True),
+            sa.Column("item_count", sa.Integer(), nullable=False),
+            sa.Column("impact_sum", sa.Integer(), nullable=False),
+            sa.Column("impact_count", sa.Integer(), nullable=False),
+        )
+
+    # Rebuild from the items; blocking writes keeps the counts exact even
+    # if the app already created the table and started adding to it
+    op.execute("LOCK TABLE news_items IN SHARE MODE")
+    op.execute("DELETE FROM news_stats")
+    op.execute(
+        "INSERT INTO news_stats "
+        "(source_id, category_cluster, item_count, impact_sum, impact_count) "
+        "SELECT coalesce(source_id, 0), coalesce(category_cluster, 'General'), "
+        "count(*), coalesce(sum(impact_score), 0), count(impact_score) "
+        "FROM news_items GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("news_stats")
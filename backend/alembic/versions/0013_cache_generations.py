@@ -0,0 +1,29 @@
+"""shared response cache generations
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("cache_generations"):
+        op.create_table(
+            "cache_generations",
+            sa.Column("namespace", sa.String(), primary_key=True),
+            sa.Column("generation", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("cache_generations")
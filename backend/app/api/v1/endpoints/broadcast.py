@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.schemas.broadcast import BroadcastRequest, BroadcastResponse
 from app.services import broadcast_service
 from app.db import crud
@@ -11,9 +11,9 @@ router = APIRouter()
 @router.post("/", response_model=BroadcastResponse)
 async def broadcast_item(
     request: BroadcastRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    news_item = crud.get_news_by_id(db, request.news_item_id)
+    news_item = await crud.get_news_by_id(db, request.news_item_id)
     if not news_item:
         raise HTTPException(status_code=404, detail="News item not found")
 
@@ -25,7 +25,7 @@ async def broadcast_item(
     )
 
     # Log to broadcast_logs table
-    crud.log_broadcast(
+    await crud.log_broadcast(
         db,
         news_id=request.news_item_id,
         platform=request.platform,
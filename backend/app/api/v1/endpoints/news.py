@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.schemas.news import NewsItem, NewsSearchRequest
+from app.core.database import get_async_db
+from app.core.response_cache import response_cache
+from app.schemas.news import NewsItem, NewsPage, NewsSearchRequest
 from app.db import crud
 from app.db.models import NewsItem as NewsItemModel
 from app.services.huggingface_service import hf_service
+from app.services.stats_service import dashboard_stats
+from app.services.view_counter import view_counter
 import logging
 
 router = APIRouter()
@@ -17,31 +20,45 @@ logger = logging.getLogger(__name__)
 # -----------------------------
 # List news (main feed)
 # -----------------------------
-@router.get("/", response_model=List[NewsItem])
-def read_news(
-    skip: int = 0,
-    limit: int = 50,
+@router.get("/", response_model=NewsPage)
+async def read_news(
+    request: Request,
+    limit: int = Query(50, ge=1, le=100),
     min_impact: int = 0,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get latest news, sorted by impact score.
     Optional filtering by category.
+    Pass the returned next_cursor back as `cursor` to get the next page.
     """
-    query = db.query(NewsItemModel).filter(NewsItemModel.impact_score >= min_impact)
-
-    if category and category != "all":
-        query = query.filter(NewsItemModel.category_cluster == category)
-
-    return (
-        query.order_by(
-            desc(NewsItemModel.impact_score),
-            desc(NewsItemModel.published_at),
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
+    async def build():
+        try:
+            items, next_cursor = await crud.get_news(
+                db,
+                limit=limit,
+                min_impact=min_impact,
+                category=category,
+                cursor=cursor,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return NewsPage(items=items, next_cursor=next_cursor)
+
+    return await response_cache.respond(
+        request,
+        db,
+        "news",
+        {
+            "limit": limit,
+            "min_impact": min_impact,
+            "category": category,
+            "cursor": cursor,
+        },
+        build,
     )
 
 
@@ -49,34 +66,48 @@ def read_news(
 # Favorites (static path BEFORE /{news_id})
 # -----------------------------
 @router.get("/favorites", response_model=List[NewsItem])
-def get_favorite_news(
-    db: Session = Depends(get_db),
+async def get_favorite_news(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Return only favorited news items for the current user.
     """
-    return crud.get_favorites(db, user_id=1)
+    async def build():
+        favorites = await crud.get_favorites(db, user_id=1)
+        return [NewsItem.model_validate(item) for item in favorites]
+
+    return await response_cache.respond(
+        request, db, "favorites", {"user_id": 1}, build
+    )
 
 
 # -----------------------------
 # Categories & stats (static)
 # -----------------------------
 @router.get("/categories/list")
-def get_categories(db: Session = Depends(get_db)):
+async def get_categories(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Get all unique categories."""
-    categories = (
-        db.query(NewsItemModel.category_cluster)
-        .distinct()
-        .filter(NewsItemModel.category_cluster.isnot(None))
-        .all()
+    async def build():
+        result = await db.execute(
+            select(NewsItemModel.category_cluster)
+            .distinct()
+            .filter(NewsItemModel.category_cluster.isnot(None))
+        )
+        return [cat for cat in result.scalars().all() if cat]
+
+    return await response_cache.respond(
+        request, db, "news", {"view": "categories"}, build
     )
-    return [cat[0] for cat in categories if cat[0]]
 
 
 @router.get("/stats/dashboard")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """Get dashboard statistics."""
-    return crud.get_news_stats(db)
+    return await dashboard_stats.get(db)
 
 
 # -----------------------------
@@ -85,83 +116,77 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
 @router.post("/search", response_model=List[NewsItem])
 async def search_news(
     request: NewsSearchRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Semantic search using HuggingFace embeddings + pgvector.
-    Falls back to keyword search if embedding fails.
+    mode="keyword" uses Postgres full-text search only; mode="hybrid"
+    fuses both rankings. Falls back to keyword search if embedding fails.
     """
     try:
-        query_vector = await hf_service.generate_embedding(request.query)
-
-        if query_vector and any(v != 0.0 for v in query_vector):
-            results = (
-                db.query(NewsItemModel)
-                .order_by(NewsItemModel.embedding.cosine_distance(query_vector))
-                .limit(request.limit)
-                .all()
-            )
+        if request.mode != "keyword":
+            query_vector = await hf_service.generate_query_embedding(request.query)
 
-            if results:
-                logger.info(f"Semantic search returned {len(results)} results")
-                return results
-
-        logger.info("Falling back to keyword search")
-        results = (
-            db.query(NewsItemModel)
-            .filter(
-                or_(
-                    NewsItemModel.title.ilike(f"%{request.query}%"),
-                    NewsItemModel.summary.ilike(f"%{request.query}%"),
-                )
-            )
-            .order_by(desc(NewsItemModel.impact_score))
-            .limit(request.limit)
-            .all()
-        )
+            if query_vector and any(v != 0.0 for v in query_vector):
+                if request.mode == "hybrid":
+                    results = await crud.search_news_hybrid(
+                        db, request.query, query_vector, request.limit
+                    )
+                else:
+                    results = await crud.search_news_semantic(
+                        db, query_vector, request.limit
+                    )
+
+                if results:
+                    logger.info(
+                        f"{request.mode.capitalize()} search returned {len(results)} results"
+                    )
+                    return results
+
+            logger.info("Falling back to keyword search")
 
-        return results
+        return await crud.search_news_keyword(db, request.query, request.limit)
 
     except Exception as e:
         logger.error(f"Search error: {e}")
-        return (
-            db.query(NewsItemModel)
+        await db.rollback()
+        result = await db.execute(
+            select(NewsItemModel)
             .filter(NewsItemModel.impact_score >= 50)
             .order_by(desc(NewsItemModel.published_at))
             .limit(request.limit)
-            .all()
         )
+        return result.scalars().all()
 
 
 # -----------------------------
 # Single news item & favorite
 # -----------------------------
 @router.get("/{news_id}", response_model=NewsItem)
-def get_news_item(news_id: int, db: Session = Depends(get_db)):
+async def get_news_item(news_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific news item by ID."""
-    news = crud.get_news_by_id(db, news_id)
+    news = await crud.get_news_by_id(db, news_id)
     if not news:
         raise HTTPException(status_code=404, detail="News item not found")
 
-    # Increment view count
-    news.view_count += 1
-    db.commit()
+    # Buffered increment, flushed in batches by the scheduler
+    view_counter.record(news_id)
 
     return news
 
 
 @router.post("/{news_id}/favorite")
-def toggle_favorite_news(
+async def toggle_favorite_news(
     news_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Toggle favorite status for a news item.
     For now assumes a single user (user_id=1).
     """
-    news = crud.get_news_by_id(db, news_id)
+    news = await crud.get_news_by_id(db, news_id)
     if not news:
         raise HTTPException(status_code=404, detail="News item not found")
 
-    is_favorited = crud.toggle_favorite(db, news_id=news_id, user_id=1)
+    is_favorited = await crud.toggle_favorite(db, news_id=news_id, user_id=1)
     return {"news_id": news_id, "is_favorited": is_favorited}
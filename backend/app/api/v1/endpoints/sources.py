@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.db import crud
+from app.services.stats_service import dashboard_stats
 from pydantic import BaseModel
 
 class SourceCreate(BaseModel):
@@ -11,9 +12,11 @@ class SourceCreate(BaseModel):
 router = APIRouter()
 
 @router.post("/")
-def add_source(source: SourceCreate, db: Session = Depends(get_db)):
-    return crud.create_source(db, source.name, source.url)
+async def add_source(source: SourceCreate, db: AsyncSession = Depends(get_async_db)):
+    db_source = await crud.create_source(db, source.name, source.url)
+    dashboard_stats.invalidate()
+    return db_source
 
 @router.get("/")
-def list_sources(db: Session = Depends(get_db)):
-    return crud.get_active_sources(db)
\ No newline at end of file
+async def list_sources(db: AsyncSession = Depends(get_async_db)):
+    return await crud.get_active_sources(db)
\ No newline at end of file
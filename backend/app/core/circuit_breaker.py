@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls pass; ``failure_threshold`` consecutive failures open it.
+    open: calls are rejected at once until ``cooldown_seconds`` pass.
+    half_open: a single probe call is let through; its success closes the
+    circuit, its failure opens it for another cooldown. A probe that never
+    reports back is given up after ``probe_timeout_seconds``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        probe_timeout_seconds: float = 60.0,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+
+        # Set while open, so queued callers can give up waiting
+        self.opened = asyncio.Event()
+
+        # Metrics
+        self._rejected = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.cooldown_seconds
+        ):
+            self._state = self.HALF_OPEN
+            self.opened.clear()
+        return self._state
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == self.CLOSED
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead. In half_open this reserves the probe,
+        so the caller must report the outcome.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight_now():
+            self._probe_in_flight = True
+            self._probe_started_at = time.monotonic()
+            return True
+
+        self._rejected += 1
+        return False
+
+    def release_probe(self) -> None:
+        """
+        Give back a probe reservation whose call ended without an outcome,
+        e.g. because it was cancelled, so the next caller can probe.
+        """
+        self._probe_in_flight = False
+
+    def _probe_in_flight_now(self) -> bool:
+        if (
+            self._probe_in_flight
+            and time.monotonic() - self._probe_started_at
+            >= self.probe_timeout_seconds
+        ):
+            self._probe_in_flight = False
+        return self._probe_in_flight
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self.opened.clear()
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self._times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self.opened.set()
+        self._probe_in_flight = False
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected": self._rejected,
+            "times_opened": self._times_opened,
+        }
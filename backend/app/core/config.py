@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).resolve().parents[2]  # backend/
@@ -19,12 +19,93 @@ class Settings(BaseSettings):
     HUGGINGFACE_API_KEY: str
     HUGGINGFACE_MODEL_ID: str = "sentence-transformers/all-MiniLM-L6-v2"
 
+    # Hugging Face HTTP client
+    HF_HTTP_TIMEOUT: float = 30.0
+    HF_HTTP_CONNECT_TIMEOUT: float = 10.0
+    HF_HTTP_MAX_CONNECTIONS: int = 20
+    HF_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+
+    # Analysis cache
+    ANALYSIS_CACHE_SIZE: int = 2048
+    ANALYSIS_CACHE_TTL_HOURS: int = 24 * 7
+    ANALYSIS_CACHE_PERSIST: bool = True
+
     # Embeddings
     HUGGINGFACE_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_MAX_SEQ_LENGTH: int = 256
+    # "torch" (sentence-transformers fp32), "onnx" or "onnx-int8"
+    EMBEDDING_BACKEND: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    EMBEDDING_ONNX_CACHE_DIR: str = str(BASE_DIR / ".cache" / "onnx")
+    # Worker processes for embeddings; 0 encodes in-process on threads
+    EMBEDDING_WORKERS: int = 0
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+
+    # pgvector query-time tuning (recall vs latency)
+    PGVECTOR_HNSW_EF_SEARCH: int = 40
+    PGVECTOR_IVFFLAT_PROBES: int = 10
+
+    # Hybrid search (reciprocal rank fusion)
+    SEARCH_HYBRID_CANDIDATES: int = 50
+    SEARCH_RRF_K: int = 60
+
+    # Ingestion
+    RECENT_URL_CACHE_SIZE: int = 10000
+    INGESTION_MAX_CONCURRENT_SOURCES: int = 5
+    # "streaming" reads feeds incrementally and stops early;
+    # "feedparser" downloads and parses whole documents
+    FEED_PARSER_MODE: Literal["streaming", "feedparser"] = "streaming"
+    FEED_MAX_ENTRIES: int = 10
+    FEED_MAX_BYTES: int = 2_000_000
+    FEED_PARSE_TIMEOUT_SECONDS: float = 20.0
+    # Only the instance holding this Postgres advisory lock runs a cycle;
+    # the lease expires this long after the leader's last heartbeat
+    INGESTION_LOCK_ID: int = 7_240_915
+    INGESTION_LEASE_SECONDS: int = 300
+
+    # Adaptive per-source fetch scheduling
+    INGESTION_TICK_MINUTES: int = 5
+    FETCH_INTERVAL_DEFAULT_MINUTES: int = 15
+    FETCH_INTERVAL_MIN_MINUTES: int = 5
+    FETCH_INTERVAL_MAX_MINUTES: int = 240
+    FETCH_TARGET_NEW_ITEMS: float = 3.0
+    FETCH_RATE_EWMA_ALPHA: float = 0.3
+    # Same normalized title within this window counts as a duplicate
+    TITLE_DEDUP_WINDOW_DAYS: int = 7
+
+    # Semantic near-duplicate suppression (cosine on embeddings)
+    SEMANTIC_DEDUP_ENABLED: bool = True
+    SEMANTIC_DEDUP_THRESHOLD: float = 0.95
+    SEMANTIC_DEDUP_WINDOW_DAYS: int = 3
+    SEMANTIC_DEDUP_RELOAD_MINUTES: int = 360
+
+    # View counts are buffered and written in batches
+    VIEW_COUNT_FLUSH_SECONDS: int = 30
+
+    # Dashboard stats are served from memory and rebuilt at this interval
+    STATS_REFRESH_SECONDS: int = 300
+
+    # Read endpoint response cache (invalidated via cache_generations)
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
 
     # Rate limiting
     MAX_REQUESTS_PER_MINUTE: int = 60  # default; override via env if needed
+    HF_RATE_LIMIT_BURST: int = 5
+    HF_MAX_IN_FLIGHT: int = 4
+    # Circuit breaker around the inference API
+    HF_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    HF_CIRCUIT_COOLDOWN_SECONDS: int = 60
+    # Fallback-analyzed items are re-analyzed once the circuit closes
+    REANALYSIS_INTERVAL_MINUTES: int = 10
+    REANALYSIS_BATCH_SIZE: int = 50
+    REANALYSIS_WINDOW_DAYS: int = 2
+    REANALYSIS_MAX_ATTEMPTS: int = 3
+    # Pack up to this many short articles into one analysis prompt (1 = off)
+    ANALYSIS_MICRO_BATCH_SIZE: int = 1
+    ANALYSIS_MICRO_BATCH_MAX_CHARS: int = 600
 
     # CORS (string, then parsed)
     BACKEND_CORS_ORIGINS_RAW: Optional[str] = None
@@ -1,4 +1,8 @@
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
@@ -23,6 +27,30 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine (asyncpg) for request handlers and ingestion.
+# asyncpg takes ssl as a connect arg and rejects libpq-only query params.
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(
+    drivername="postgresql+asyncpg"
+).difference_update_query(["sslmode", "channel_binding"])
+
+#  Pooler-safe: no statement caches, unique prepared statement names
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    connect_args={
+        "ssl": "require",
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # FastAPI dependency
 def get_db():
     db = SessionLocal()
@@ -30,3 +58,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
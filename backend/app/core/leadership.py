@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _heartbeat(db: AsyncSession, owner: asyncio.Task) -> None:
+    """
+    Keep the lock transaction from going idle while the leader works.
+    If the lock connection is lost, so is the lock: stop the leader.
+    """
+    interval = settings.INGESTION_LEASE_SECONDS / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await db.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.error(f" Leadership lock lost ({e}), stopping leader")
+            owner.cancel()
+            return
+
+
+@asynccontextmanager
+async def advisory_leadership(
+    session_factory: async_sessionmaker, lock_id: int
+) -> AsyncIterator[bool]:
+    """
+    Try to become the single leader for a job across all workers and
+    replicas. Yields True when this instance holds the lock.
+
+    Uses a transaction-level advisory lock held in an open transaction
+    on a dedicated connection, which is safe behind a transaction-mode
+    pooler. The lock is released when the block exits, and by Postgres
+    when the holder's connection dies, so another instance takes over on
+    its next run.
+
+    While the leader runs, a heartbeat query keeps the transaction
+    active. idle_in_transaction_session_timeout (INGESTION_LEASE_SECONDS)
+    only expires the lease when heartbeats stop, i.e. when the leader's
+    process or event loop is stuck, however long a healthy cycle takes.
+    """
+    async with session_factory() as db:
+        async with db.begin():
+            await db.execute(text(
+                "SET LOCAL idle_in_transaction_session_timeout = "
+                f"'{int(settings.INGESTION_LEASE_SECONDS)}s'"
+            ))
+            acquired = await db.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:lock_id)"),
+                {"lock_id": lock_id},
+            )
+            if not acquired:
+                yield False
+                return
+
+            heartbeat = asyncio.create_task(
+                _heartbeat(db, asyncio.current_task())
+            )
+            try:
+                yield True
+            finally:
+                heartbeat.cancel()
+                try:
+                    await heartbeat
+                except asyncio.CancelledError:
+                    pass
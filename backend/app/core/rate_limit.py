@@ -0,0 +1,139 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+
+class AcquireAborted(Exception):
+    """
+    Raised by AsyncTokenBucket.acquire when its abort event is set while
+    the caller is still waiting; no slot or token is kept.
+    """
+
+
+async def _wait_unless(awaitable, abort: Optional[asyncio.Event]):
+    if abort is None:
+        return await awaitable
+
+    waiter = asyncio.ensure_future(awaitable)
+    aborter = asyncio.ensure_future(abort.wait())
+    try:
+        await asyncio.wait({waiter, aborter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        aborter.cancel()
+
+    if waiter.done():
+        return waiter.result()
+    waiter.cancel()
+    raise AcquireAborted()
+
+
+class AsyncTokenBucket:
+    """
+    Async token-bucket limiter with a cap on in-flight calls.
+
+    Tokens refill at ``max_calls_per_minute / 60`` per second up to
+    ``burst``. Each caller reserves a token under a lock before sleeping,
+    so concurrent callers are spaced out instead of all reading the same
+    stale timestamp and bursting through together.
+    """
+
+    def __init__(
+        self,
+        max_calls_per_minute: int,
+        burst: int = 1,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.rate = max_calls_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_in_flight = max_in_flight
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._in_flight_slots = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        )
+
+        # Metrics
+        self._acquired = 0
+        self._waiting = 0
+        self._in_flight = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def _reserve_token(self) -> float:
+        """
+        Take a token, returning how long the caller must sleep before use.
+        """
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated_at) * self.rate,
+            )
+            self._updated_at = now
+
+            # Tokens may go negative: that debt is this caller's queue slot
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    @asynccontextmanager
+    async def acquire(self, abort: Optional[asyncio.Event] = None):
+        """
+        Wait for an in-flight slot and a token. If ``abort`` is set while
+        waiting, the slot and token are given back and AcquireAborted is
+        raised.
+        """
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            if abort is not None and abort.is_set():
+                raise AcquireAborted()
+            if self._in_flight_slots is not None:
+                await _wait_unless(self._in_flight_slots.acquire(), abort)
+            try:
+                delay = await self._reserve_token()
+                if delay > 0:
+                    try:
+                        await _wait_unless(asyncio.sleep(delay), abort)
+                    except BaseException:
+                        # Unused token: hand it back to the queue
+                        self._tokens += 1
+                        raise
+            except BaseException:
+                if self._in_flight_slots is not None:
+                    self._in_flight_slots.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started
+        self._acquired += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        self._in_flight += 1
+
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight_slots is not None:
+                self._in_flight_slots.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+            "max_in_flight": self.max_in_flight,
+            "acquired": self._acquired,
+            "waiting": self._waiting,
+            "in_flight": self._in_flight,
+            "avg_wait_seconds": (
+                round(self._total_wait / self._acquired, 3)
+                if self._acquired else 0.0
+            ),
+            "max_wait_seconds": round(self._max_wait, 3),
+        }
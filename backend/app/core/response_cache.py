@@ -0,0 +1,71 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.db import crud
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses for read endpoints.
+
+    Keys include the namespace's generation from the cache_generations
+    table, which writers bump in the transaction that changes the data
+    (ingestion and re-analysis for "news", favorite toggles for
+    "favorites"), so no worker serves entries older than the last commit.
+    Responses carry a strong ETag and conditional requests get 304 Not
+    Modified.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        # Last generation seen per namespace, for /metrics
+        self.generations: Counter = Counter()
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def respond(
+        self,
+        request: Request,
+        db: AsyncSession,
+        namespace: str,
+        params: Dict[str, Hashable],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        generation = await crud.get_cache_generation(db, namespace)
+        self.generations[namespace] = generation
+        key = (namespace, generation, tuple(sorted(params.items())))
+
+        cached = self.entries.get(key)
+        if cached is None:
+            body = json.dumps(
+                jsonable_encoder(await build()), separators=(",", ":")
+            ).encode("utf-8")
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            cached = (body, etag)
+            self.entries.set(key, cached)
+
+        body, etag = cached
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=body, media_type="application/json", headers=headers
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.entries.stats(), "generations": dict(self.generations)}
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
@@ -1,104 +1,437 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import undefer
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import base64
+import json
 
-from app.db.models import NewsItem, Source, Favorite, BroadcastLog
+from app.core.config import settings
+from app.db.models import (
+    BroadcastLog,
+    CacheGeneration,
+    Favorite,
+    NewsItem,
+    NewsStats,
+    Source,
+)
 
 
-def get_news(db: Session, skip: int = 0, limit: int = 50, min_impact: int = 0):
+def encode_news_cursor(news: NewsItem) -> str:
+    """
+    Opaque keyset cursor for the (impact_score, published_at, id) order.
+    """
+    payload = json.dumps(
+        [news.impact_score, news.published_at.isoformat(), news.id]
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_news_cursor(cursor: str) -> Tuple[int, datetime, int]:
+    """
+    Raises ValueError for malformed cursors.
+    """
+    try:
+        impact_score, published_at, news_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return (
+            int(impact_score),
+            datetime.fromisoformat(published_at),
+            int(news_id),
+        )
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def get_news(
+    db: AsyncSession,
+    limit: int = 50,
+    min_impact: int = 0,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[NewsItem], Optional[str]]:
+    """
+    One page of the main feed plus the cursor for the next page.
+    Keyset pagination keeps deep pages as cheap as the first one.
+    """
+    query = select(NewsItem).filter(NewsItem.impact_score >= min_impact)
+
+    if category and category != "all":
+        query = query.filter(NewsItem.category_cluster == category)
+
+    if cursor:
+        impact_score, published_at, news_id = decode_news_cursor(cursor)
+
+        # Rows after the cursor in DESC order. A row comparison matches
+        # ix_news_items_feed_order, so the index scan starts at the cursor
+        query = query.filter(
+            NewsItem.impact_score <= impact_score,
+            tuple_(NewsItem.impact_score, NewsItem.published_at, NewsItem.id)
+            < tuple_(impact_score, published_at, news_id),
+        )
+
+    result = await db.execute(
+        query.order_by(
+            desc(NewsItem.impact_score),
+            desc(NewsItem.published_at),
+            desc(NewsItem.id),
+        )
+        .limit(limit + 1)
+    )
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_news_cursor(items[-1])
+
+    return items, next_cursor
+
+
+def vector_search_settings():
+    """
+    Filter that sets the pgvector index search parameters for the current
+    transaction as part of the search statement itself.
+
+    The uncorrelated subquery becomes a one-time filter that Postgres
+    evaluates before the first index tuple is read, so no separate round
+    trip is needed and it is safe behind a transaction pooler.
+    """
+    applied = select(
+        func.set_config(
+            "hnsw.ef_search", str(settings.PGVECTOR_HNSW_EF_SEARCH), True
+        ).concat(
+            func.set_config(
+                "ivfflat.probes", str(settings.PGVECTOR_IVFFLAT_PROBES), True
+            )
+        )
+    ).scalar_subquery()
+    return applied.isnot(None)
+
+
+async def search_news_semantic(
+    db: AsyncSession, query_vector: List[float], limit: int = 10
+) -> List[NewsItem]:
+    result = await db.execute(
+        select(NewsItem)
+        .filter(vector_search_settings())
+        .order_by(NewsItem.embedding.cosine_distance(query_vector))
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def search_news_keyword(
+    db: AsyncSession, query: str, limit: int = 10
+) -> List[NewsItem]:
+    """
+    Full-text search on the GIN-indexed search_vector column.
+    """
+    tsquery = func.websearch_to_tsquery("english", query)
+    rank = func.ts_rank(NewsItem.search_vector, tsquery)
+    result = await db.execute(
+        select(NewsItem)
+        .filter(NewsItem.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), desc(NewsItem.impact_score))
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def search_news_hybrid(
+    db: AsyncSession, query: str, query_vector: List[float], limit: int = 10
+) -> List[NewsItem]:
+    """
+    Fuse pgvector and full-text rankings with reciprocal rank fusion
+    in a single statement.
+    """
+    candidates = max(limit, settings.SEARCH_HYBRID_CANDIDATES)
+    rrf_k = settings.SEARCH_RRF_K
+
+    distance = NewsItem.embedding.cosine_distance(query_vector)
+    semantic = (
+        select(
+            NewsItem.id.label("id"),
+            func.row_number().over(order_by=distance).label("rank"),
+        )
+        .filter(vector_search_settings())
+        .order_by(distance)
+        .limit(candidates)
+        .cte("semantic")
+    )
+
+    tsquery = func.websearch_to_tsquery("english", query)
+    ts_rank = func.ts_rank(NewsItem.search_vector, tsquery)
+    keyword = (
+        select(
+            NewsItem.id.label("id"),
+            func.row_number().over(order_by=ts_rank.desc()).label("rank"),
+        )
+        .filter(NewsItem.search_vector.op("@@")(tsquery))
+        .order_by(ts_rank.desc())
+        .limit(candidates)
+        .cte("keyword")
+    )
+
+    score = (
+        func.coalesce(1.0 / (rrf_k + semantic.c.rank), 0.0)
+        + func.coalesce(1.0 / (rrf_k + keyword.c.rank), 0.0)
+    ).label("score")
+    fused = (
+        select(func.coalesce(semantic.c.id, keyword.c.id).label("id"), score)
+        .select_from(
+            semantic.join(keyword, semantic.c.id == keyword.c.id, full=True)
+        )
+        .subquery("fused")
+    )
+
+    result = await db.execute(
+        select(NewsItem)
+        .join(fused, NewsItem.id == fused.c.id)
+        .order_by(fused.c.score.desc(), desc(NewsItem.impact_score))
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_news_by_id(db: AsyncSession, news_id: int):
+    return await db.get(NewsItem, news_id)
+
+
+async def get_existing_news_keys(
+    db: AsyncSession,
+    canonical_urls: Iterable[str],
+    fingerprints: Iterable[str],
+    since: datetime,
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Canonical URLs already stored, and title fingerprints stored since
+    the given time, out of the ones asked for.
+    """
+    canonical_urls = set(canonical_urls)
+    fingerprints = set(fingerprints)
+    if not canonical_urls and not fingerprints:
+        return set(), set()
+
+    result = await db.execute(
+        select(NewsItem.canonical_url, NewsItem.title_fingerprint).filter(
+            or_(
+                NewsItem.canonical_url.in_(canonical_urls),
+                and_(
+                    NewsItem.title_fingerprint.in_(fingerprints),
+                    NewsItem.created_at >= since,
+                ),
+            )
+        )
+    )
+    rows = result.all()
     return (
-        db.query(NewsItem)
-        .filter(NewsItem.impact_score >= min_impact)
-        .order_by(desc(NewsItem.impact_score), desc(NewsItem.published_at))
-        .offset(skip)
+        {url for url, _ in rows if url in canonical_urls},
+        {fp for _, fp in rows if fp in fingerprints},
+    )
+
+
+async def get_items_needing_reanalysis(
+    db: AsyncSession, since: datetime, limit: int
+) -> List[NewsItem]:
+    result = await db.execute(
+        select(NewsItem)
+        .options(undefer(NewsItem.analysis_input))
+        .filter(NewsItem.needs_reanalysis == True, NewsItem.created_at >= since)
+        .order_by(NewsItem.created_at.desc())
         .limit(limit)
-        .all()
     )
+    return result.scalars().all()
 
 
-def get_news_by_id(db: Session, news_id: int):
-    return db.query(NewsItem).filter(NewsItem.id == news_id).first()
+async def get_recent_embeddings(db: AsyncSession, since: datetime):
+    result = await db.execute(
+        select(NewsItem.title, NewsItem.embedding, NewsItem.created_at)
+        .filter(NewsItem.created_at >= since, NewsItem.embedding.isnot(None))
+    )
+    return result.all()
 
 
-def create_source(db: Session, name: str, url: str, source_type: str = "rss"):
-    existing = db.query(Source).filter(Source.name == name).first()
+async def create_source(db: AsyncSession, name: str, url: str, source_type: str = "rss"):
+    result = await db.execute(select(Source).filter(Source.name == name))
+    existing = result.scalars().first()
     if existing:
         if existing.url != url:
             existing.url = url
             existing.source_type = source_type
-            db.commit()
-            db.refresh(existing)
+            await db.commit()
+            await db.refresh(existing)
         return existing
 
     db_source = Source(name=name, url=url, source_type=source_type)
     db.add(db_source)
-    db.commit()
-    db.refresh(db_source)
+    await db.commit()
+    await db.refresh(db_source)
     return db_source
 
 
-def get_active_sources(db: Session):
-    return db.query(Source).filter(Source.is_active == True).all()
+async def get_active_sources(db: AsyncSession):
+    result = await db.execute(select(Source).filter(Source.is_active == True))
+    return result.scalars().all()
+
+
+async def get_due_sources(db: AsyncSession, now: datetime):
+    result = await db.execute(
+        select(Source).filter(
+            Source.is_active == True,
+            or_(Source.next_fetch_at.is_(None), Source.next_fetch_at <= now),
+        )
+    )
+    return result.scalars().all()
 
 
-def update_source_fetch_stats(db: Session, source_id: int):
-    source = db.query(Source).filter(Source.id == source_id).first()
+async def update_source_fetch_stats(
+    db: AsyncSession,
+    source_id: int,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    new_item_rate: Optional[float] = None,
+    fetch_interval_minutes: Optional[int] = None,
+    next_fetch_at: Optional[datetime] = None,
+):
+    source = await db.get(Source, source_id)
     if source:
-        source.last_fetched = datetime.utcnow()
+        source.last_fetched = datetime.now(timezone.utc)
         source.fetch_count += 1
-        db.commit()
+        source.etag = etag
+        source.last_modified = last_modified
+        if next_fetch_at is not None:
+            source.new_item_rate = new_item_rate
+            source.fetch_interval_minutes = fetch_interval_minutes
+            source.next_fetch_at = next_fetch_at
+        await db.commit()
 
 
-def toggle_favorite(db: Session, news_id: int, user_id: int = 1):
-    existing = (
-        db.query(Favorite)
+async def defer_source_fetch(db: AsyncSession, source_id: int, next_fetch_at: datetime):
+    source = await db.get(Source, source_id)
+    if source:
+        source.next_fetch_at = next_fetch_at
+        await db.commit()
+
+
+async def toggle_favorite(db: AsyncSession, news_id: int, user_id: int = 1):
+    result = await db.execute(
+        select(Favorite)
         .filter(
             Favorite.news_item_id == news_id,
             Favorite.user_id == user_id,
         )
-        .first()
     )
+    existing = result.scalars().first()
 
     if existing:
-        db.delete(existing)
-        db.commit()
+        await db.delete(existing)
+        await bump_cache_generation(db, "favorites")
+        await db.commit()
         return False
 
     new_fav = Favorite(news_item_id=news_id, user_id=user_id)
     db.add(new_fav)
-    db.commit()
+    await bump_cache_generation(db, "favorites")
+    await db.commit()
     return True
 
 
-def get_favorites(db: Session, user_id: int = 1):
-    favorites = (
-        db.query(NewsItem)
+async def get_favorites(db: AsyncSession, user_id: int = 1):
+    result = await db.execute(
+        select(NewsItem)
         .join(Favorite)
         .filter(Favorite.user_id == user_id)
         .order_by(desc(Favorite.created_at))
-        .all()
     )
-    return favorites
+    return result.scalars().all()
 
 
-def log_broadcast(db: Session, news_id: int, platform: str, status: str = "success"):
+async def log_broadcast(db: AsyncSession, news_id: int, platform: str, status: str = "success"):
     log = BroadcastLog(news_item_id=news_id, platform=platform, status=status)
     db.add(log)
 
-    news = db.query(NewsItem).filter(NewsItem.id == news_id).first()
+    news = await db.get(NewsItem, news_id)
     if news:
         news.broadcast_count += 1
 
-    db.commit()
+    await db.commit()
+
+
+async def get_news_stats(db: AsyncSession):
+    """
+    Item counts and impact sums by source and category from the news_stats
+    summary table, plus the source table.
+    """
+    grouped = await db.execute(
+        select(
+            NewsStats.source_id,
+            NewsStats.category_cluster,
+            NewsStats.item_count,
+            NewsStats.impact_sum,
+            NewsStats.impact_count,
+        ).filter(NewsStats.item_count > 0)
+    )
+    sources = await db.execute(select(Source.id, Source.name, Source.is_active))
+
+    return grouped.all(), sources.all()
+
 
+async def add_news_stats(
+    db: AsyncSession, deltas: Dict[Tuple[int, str], Tuple[int, int, int]]
+):
+    """
+    Add (item_count, impact_sum, impact_count) deltas to the news_stats rows
+    of each (source_id, category_cluster). Does not commit, so the caller
+    can apply it in the transaction that changes the items.
+    """
+    if not deltas:
+        return
 
-def get_news_stats(db: Session):
-    total_news = db.query(func.count(NewsItem.id)).scalar()
-    total_sources = db.query(func.count(Source.id)).filter(Source.is_active == True).scalar()
-    avg_impact = db.query(func.avg(NewsItem.impact_score)).scalar()
+    # Fixed key order so concurrent writers lock rows in the same order
+    rows = [
+        {
+            "source_id": source_id,
+            "category_cluster": category,
+            "item_count": count,
+            "impact_sum": impact_sum,
+            "impact_count": impact_count,
+        }
+        for (source_id, category), (count, impact_sum, impact_count)
+        in sorted(deltas.items())
+    ]
+    statement = insert(NewsStats).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[NewsStats.source_id, NewsStats.category_cluster],
+        set_={
+            "item_count": NewsStats.item_count + statement.excluded.item_count,
+            "impact_sum": NewsStats.impact_sum + statement.excluded.impact_sum,
+            "impact_count": NewsStats.impact_count + statement.excluded.impact_count,
+        },
+    )
+    await db.execute(statement)
 
-    return {
-        "total_news": total_news,
-        "total_sources": total_sources,
-        "avg_impact_score": round(avg_impact, 2) if avg_impact else 0,
-    }
+
+async def get_cache_generation(db: AsyncSession, namespace: str) -> int:
+    result = await db.execute(
+        select(CacheGeneration.generation).filter(
+            CacheGeneration.namespace == namespace
+        )
+    )
+    return result.scalar() or 0
+
+
+async def bump_cache_generation(db: AsyncSession, namespace: str):
+    """
+    Invalidate a response cache namespace in every worker. Does not
+    commit; call it last in the transaction that changes the data so the
+    row lock is held briefly.
+    """
+    statement = insert(CacheGeneration).values(namespace=namespace, generation=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=[CacheGeneration.namespace],
+        set_={"generation": CacheGeneration.generation + 1},
+    )
+    await db.execute(statement)
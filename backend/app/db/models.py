@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, BigInteger, Integer, Float, String, Boolean, Text, DateTime, ForeignKey, JSON, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 
@@ -18,6 +19,15 @@ class Source(Base):
     last_fetched = Column(DateTime(timezone=True), nullable=True)
     fetch_count = Column(Integer, default=0)
 
+    # HTTP validators for conditional feed requests
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+
+    # Adaptive fetch schedule (app.services.fetch_scheduler)
+    fetch_interval_minutes = Column(Integer, nullable=True)
+    next_fetch_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    new_item_rate = Column(Float, nullable=True)
+
 
 class NewsItem(Base):
     __tablename__ = "news_items"
@@ -27,14 +37,32 @@ class NewsItem(Base):
 
     title = Column(Text, nullable=False)
     url = Column(Text, unique=True, nullable=False)
-    published_at = Column(DateTime(timezone=True))
+    # Dedup keys (app.services.normalization)
+    canonical_url = Column(Text, nullable=True)
+    title_fingerprint = Column(String(32), nullable=True)
+    # Defaults to ingestion time; NOT NULL keeps the feed keyset a plain row comparison
+    published_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     summary = Column(Text)
     impact_score = Column(Integer, default=0)
     sentiment = Column(String, default="Neutral")
     category_cluster = Column(String, default="General")
+    # Set when analysis used the fallback path; see IngestionService.reanalyze_items
+    needs_reanalysis = Column(Boolean, default=False, server_default="false", nullable=False)
+    reanalysis_attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    # Original feed text, kept only while needs_reanalysis is set
+    analysis_input = deferred(Column(Text, nullable=True))
 
     embedding = Column(Vector(384))
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary, ''))",
+                persisted=True,
+            ),
+        )
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     view_count = Column(Integer, default=0)
@@ -42,6 +70,59 @@ class NewsItem(Base):
 
     source = relationship("Source")
 
+    __table_args__ = (
+        # Main feed order (keyset pagination in crud.get_news)
+        Index(
+            "ix_news_items_feed_order",
+            impact_score.desc(),
+            published_at.desc(),
+            id.desc(),
+        ),
+        Index("ix_news_items_category_cluster", category_cluster),
+        Index("ix_news_items_canonical_url", canonical_url),
+        Index("ix_news_items_title_fingerprint", title_fingerprint, created_at),
+        Index(
+            "ix_news_items_needs_reanalysis",
+            created_at,
+            postgresql_where=needs_reanalysis,
+        ),
+        Index("ix_news_items_search_vector", search_vector, postgresql_using="gin"),
+        # Approximate nearest neighbour search for /news/search
+        Index(
+            "ix_news_items_embedding_hnsw",
+            embedding,
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+
+class NewsStats(Base):
+    """
+    Running item counts per source and category for the dashboard. Kept
+    current in the same transactions that store or re-analyse items.
+    """
+    __tablename__ = "news_stats"
+
+    # 0 for items without a source
+    source_id = Column(Integer, primary_key=True)
+    category_cluster = Column(String, primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0)
+    impact_sum = Column(Integer, nullable=False, default=0)
+    impact_count = Column(Integer, nullable=False, default=0)
+
+
+class CacheGeneration(Base):
+    """
+    Shared generation counter per response cache namespace. Writers bump it
+    in the transaction that changes the data, so every worker sees it.
+    """
+    __tablename__ = "cache_generations"
+
+    namespace = Column(String, primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+
 
 class Favorite(Base):
     __tablename__ = "favorites"
@@ -60,3 +141,12 @@ class BroadcastLog(Base):
     platform = Column(String, nullable=False)
     status = Column(String, default="success")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of model + prompt input
+    model_id = Column(String, nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,17 +1,21 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import text
 
 from app.core.config import settings
-from app.core.database import engine, SessionLocal
+from app.core.database import engine, async_engine
+from app.core.response_cache import response_cache
 from app.db.base import Base
 from app.db import models
 from app.api.v1.api import api_router
 from app.services.ingestion_service import IngestionService
+from app.services.huggingface_service import hf_circuit, hf_service, hf_rate_limiter
+from app.services.view_counter import view_counter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,12 +23,12 @@ logger = logging.getLogger(__name__)
 scheduler = AsyncIOScheduler()
 
 async def fetch_news_job():
-    db = SessionLocal()
-    try:
-        service = IngestionService(db)
-        await service.run_ingestion_cycle()
-    finally:
-        db.close()
+    service = IngestionService()
+    await service.run_ingestion_cycle()
+
+async def reanalysis_job():
+    service = IngestionService()
+    await service.reanalyze_items()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -40,12 +44,40 @@ async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
     logger.info(" Database schema ready")
 
-    scheduler.add_job(fetch_news_job, "interval", minutes=15)
+    # Drop analysis cache entries from expired TTLs or previous models
+    try:
+        purged = await hf_service.analysis_cache.purge_stale()
+        logger.info(f" Analysis cache ready ({purged} stale entries purged)")
+    except Exception as e:
+        logger.error(f" Analysis cache purge failed: {e}")
+
+    # Frequent tick; each source is fetched only when its own schedule is due
+    scheduler.add_job(
+        fetch_news_job, "interval", minutes=settings.INGESTION_TICK_MINUTES
+    )
+    scheduler.add_job(
+        reanalysis_job,
+        "interval",
+        minutes=settings.REANALYSIS_INTERVAL_MINUTES,
+    )
+    scheduler.add_job(
+        view_counter.flush,
+        "interval",
+        seconds=settings.VIEW_COUNT_FLUSH_SECONDS,
+    )
     scheduler.start()
 
+    # Warm the embedding model without delaying startup; see /ready
+    warmup = asyncio.create_task(hf_service.ensure_embedding_model())
+
     yield
 
+    warmup.cancel()
+
     scheduler.shutdown()
+    await view_counter.flush()
+    await hf_service.aclose()
+    await async_engine.dispose()
     logger.info(" Application shutdown")
 
 app = FastAPI(
@@ -68,3 +100,22 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness: the embedding model is loaded and search is fully served."""
+    if not hf_service.is_ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if hf_service.is_ready else "starting",
+        "embedding_model": hf_service.embedding_model_state,
+    }
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "hf_rate_limiter": hf_rate_limiter.metrics(),
+        "hf_circuit": hf_circuit.metrics(),
+        "query_embedding_cache": hf_service.query_embedding_cache.stats(),
+        "response_cache": response_cache.stats(),
+    }
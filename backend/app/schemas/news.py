@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 class NewsItemBase(BaseModel):
     title: str
@@ -25,6 +25,12 @@ class NewsItem(NewsItemBase):
         from_attributes = True
 
 
+class NewsPage(BaseModel):
+    items: List[NewsItem]
+    next_cursor: Optional[str] = None
+
+
 class NewsSearchRequest(BaseModel):
     query: str
     limit: int = 10
+    mode: Literal["semantic", "keyword", "hybrid"] = "semantic"
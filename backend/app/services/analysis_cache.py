@@ -0,0 +1,185 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import AsyncSessionLocal
+from app.db.models import AnalysisCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """
+    Two-tier cache for LLM analysis results: an in-memory LRU in front of
+    the analysis_cache table. Keys are derived from the model id and the
+    normalized prompt input, so a model change never reuses old entries.
+    """
+
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+        self.ttl = timedelta(hours=settings.ANALYSIS_CACHE_TTL_HOURS)
+        self.memory = LRUCache(
+            maxsize=settings.ANALYSIS_CACHE_SIZE,
+            ttl=self.ttl.total_seconds(),
+        )
+
+    def make_key(self, title: str, content: str) -> str:
+        normalized = " ".join(f"{title}\n{content[:1200]}".lower().split())
+        return hashlib.sha256(
+            f"{self.model_id}\n{normalized}".encode("utf-8")
+        ).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self.memory.get(key)
+        if result is not None:
+            return dict(result)
+
+        if not settings.ANALYSIS_CACHE_PERSIST:
+            return None
+
+        try:
+            result = await self._load(key)
+        except Exception as e:
+            logger.error(f"Analysis cache read failed: {e}")
+            return None
+
+        if result is not None:
+            self.memory.set(key, result)
+            return dict(result)
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        self.memory.set(key, dict(result))
+
+        if not settings.ANALYSIS_CACHE_PERSIST:
+            return
+
+        try:
+            await self._store(key, result)
+        except Exception as e:
+            logger.error(f"Analysis cache write failed: {e}")
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Cached results for the given keys, with a single query for all
+        memory misses.
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        for key in keys:
+            result = self.memory.get(key)
+            if result is not None:
+                found[key] = dict(result)
+
+        missing = [key for key in set(keys) if key not in found]
+        if not missing or not settings.ANALYSIS_CACHE_PERSIST:
+            return found
+
+        try:
+            loaded = await self._load_many(missing)
+        except Exception as e:
+            logger.error(f"Analysis cache read failed: {e}")
+            return found
+
+        for key, result in loaded.items():
+            self.memory.set(key, result)
+            found[key] = dict(result)
+        return found
+
+    async def set_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Store many results with one batched upsert.
+        """
+        if not results:
+            return
+
+        for key, result in results.items():
+            self.memory.set(key, dict(result))
+
+        if not settings.ANALYSIS_CACHE_PERSIST:
+            return
+
+        try:
+            await self._store_many(results)
+        except Exception as e:
+            logger.error(f"Analysis cache write failed: {e}")
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(
+                select(AnalysisCacheEntry.result).filter(
+                    AnalysisCacheEntry.key == key,
+                    AnalysisCacheEntry.model_id == self.model_id,
+                    AnalysisCacheEntry.created_at
+                    >= datetime.now(timezone.utc) - self.ttl,
+                )
+            )
+
+    async def _store(self, key: str, result: Dict[str, Any]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.merge(
+                AnalysisCacheEntry(
+                    key=key,
+                    model_id=self.model_id,
+                    result=result,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+
+    async def _load_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(
+                select(AnalysisCacheEntry.key, AnalysisCacheEntry.result).filter(
+                    AnalysisCacheEntry.key.in_(keys),
+                    AnalysisCacheEntry.model_id == self.model_id,
+                    AnalysisCacheEntry.created_at
+                    >= datetime.now(timezone.utc) - self.ttl,
+                )
+            )
+            return {key: result for key, result in rows}
+
+    async def _store_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        now = datetime.now(timezone.utc)
+        statement = insert(AnalysisCacheEntry).values([
+            {
+                "key": key,
+                "model_id": self.model_id,
+                "result": result,
+                "created_at": now,
+            }
+            for key, result in results.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[AnalysisCacheEntry.key],
+            set_={
+                "model_id": statement.excluded.model_id,
+                "result": statement.excluded.result,
+                "created_at": statement.excluded.created_at,
+            },
+        )
+        async with AsyncSessionLocal() as db:
+            await db.execute(statement)
+            await db.commit()
+
+    async def purge_stale(self) -> int:
+        """
+        Delete expired entries and entries written by other models.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(AnalysisCacheEntry).filter(
+                    (AnalysisCacheEntry.model_id != self.model_id)
+                    | (
+                        AnalysisCacheEntry.created_at
+                        < datetime.now(timezone.utc) - self.ttl
+                    )
+                )
+            )
+            await db.commit()
+            return result.rowcount
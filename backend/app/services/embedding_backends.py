@@ -0,0 +1,190 @@
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Backend interface
+# --------------------------------------------------
+class EmbeddingBackend(ABC):
+    """
+    Encodes texts into L2-normalized float32 vectors, one row per text.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        ...
+
+
+# --------------------------------------------------
+# PyTorch (sentence-transformers), fp32
+# --------------------------------------------------
+class TorchEmbeddingBackend(EmbeddingBackend):
+    name = "torch"
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        # Heavy import (torch); deferred until the backend is created
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_tensor=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32)
+
+
+# --------------------------------------------------
+# ONNX Runtime, fp32 or dynamically quantized int8
+# --------------------------------------------------
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """
+    Runs the exported ONNX graph of a sentence-transformers model and
+    reproduces its mean pooling + normalization in numpy.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantized: bool = False,
+        threads: Optional[int] = None,
+    ):
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        self.name = "onnx-int8" if quantized else "onnx"
+
+        model_path = self.prepare(model_name, quantized)
+
+        self.tokenizer = Tokenizer.from_file(
+            hf_hub_download(model_name, "tokenizer.json")
+        )
+        self.tokenizer.enable_truncation(
+            max_length=settings.EMBEDDING_MAX_SEQ_LENGTH
+        )
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        # ONNX Runtime ignores OMP_NUM_THREADS; size its pools explicitly
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    @classmethod
+    def prepare(cls, model_name: str, quantized: bool = False) -> str:
+        """
+        Download (and quantize) the model files; returns the model path.
+        """
+        from huggingface_hub import hf_hub_download
+
+        model_path = hf_hub_download(model_name, "onnx/model.onnx")
+        hf_hub_download(model_name, "tokenizer.json")
+        if quantized:
+            model_path = cls._quantize(model_name, model_path)
+        return model_path
+
+    @staticmethod
+    def _quantize(model_name: str, model_path: str) -> str:
+        """
+        Quantize weights to int8 once and cache the result on disk.
+        Written to a temporary file and renamed, so concurrent workers
+        or a crash never leave a partial model at the cached path.
+        """
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        cache_dir = Path(settings.EMBEDDING_ONNX_CACHE_DIR) / model_name.replace("/", "--")
+        quantized_path = cache_dir / "model_int8.onnx"
+
+        if not quantized_path.exists():
+            logger.info(f"Quantizing ONNX embedding model to {quantized_path}")
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_dir / f"model_int8.{os.getpid()}.tmp.onnx"
+            try:
+                quantize_dynamic(
+                    model_path,
+                    str(tmp_path),
+                    weight_type=QuantType.QInt8,
+                )
+                os.replace(tmp_path, quantized_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+        return str(quantized_path)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        vectors = []
+
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array(
+                [e.attention_mask for e in encodings], dtype=np.int64
+            )
+
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real tokens, then L2 normalization
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+            pooled /= np.clip(
+                np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None
+            )
+            vectors.append(pooled.astype(np.float32))
+
+        if not vectors:
+            return np.zeros((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        return np.vstack(vectors)
+
+
+def create_embedding_backend(
+    backend: str, model_name: str, threads: Optional[int] = None
+) -> EmbeddingBackend:
+    if backend == "torch":
+        return TorchEmbeddingBackend(model_name, threads=threads)
+    if backend == "onnx":
+        return OnnxEmbeddingBackend(model_name, threads=threads)
+    if backend == "onnx-int8":
+        return OnnxEmbeddingBackend(model_name, quantized=True, threads=threads)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def prepare_embedding_backend(backend: str, model_name: str) -> None:
+    """
+    Fetch and convert model files once in the parent process, before
+    worker processes load them concurrently.
+    """
+    if backend in ("onnx", "onnx-int8"):
+        OnnxEmbeddingBackend.prepare(model_name, quantized=backend == "onnx-int8")
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from app.services.embedding_backends import (
+    EmbeddingBackend,
+    create_embedding_backend,
+    prepare_embedding_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+# Loaded once per worker process by _init_worker
+_worker_backend: Optional[EmbeddingBackend] = None
+
+
+def _init_worker(backend: str, model_name: str, threads: int):
+    global _worker_backend
+
+    # Split cores between workers instead of each grabbing all of them
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(threads))
+
+    _worker_backend = create_embedding_backend(backend, model_name, threads=threads)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> bytes:
+    # Raw float32 bytes are much cheaper to pickle than nested lists
+    vectors = _worker_backend.encode(texts, batch_size)
+    return np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+
+
+class EmbeddingProcessPool:
+    """
+    Runs embedding encodes in dedicated worker processes so CPU-heavy
+    batches neither hold the GIL nor compete with request handling.
+    """
+
+    def __init__(self, workers: int, backend: str, model_name: str, dimension: int):
+        self.workers = workers
+        self.dimension = dimension
+        self.backend = backend
+        self.model_name = model_name
+        threads = max(1, (os.cpu_count() or 1) // workers)
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend, model_name, threads),
+        )
+
+    async def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(
+            self.executor, _encode_in_worker, texts, batch_size
+        )
+        return np.frombuffer(data, dtype=np.float32).reshape(len(texts), self.dimension)
+
+    async def start(self) -> None:
+        """
+        Spawn every worker and load its model before serving traffic.
+        Model files are prepared here first so workers only read them.
+        """
+        await asyncio.to_thread(
+            prepare_embedding_backend, self.backend, self.model_name
+        )
+        await asyncio.gather(
+            *[self.encode(["warmup"]) for _ in range(self.workers)]
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
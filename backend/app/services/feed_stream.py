@@ -0,0 +1,184 @@
+import logging
+import time
+from contextlib import aclosing
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional
+
+import feedparser
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Element names (namespace stripped) that delimit one entry
+ENTRY_TAGS = {"item", "entry"}
+
+# Child element -> entry key, first match wins
+FIELD_TAGS = {
+    "title": "title",
+    "link": "link",
+    "guid": "id",
+    "id": "id",
+    "description": "summary",
+    "summary": "summary",
+    "encoded": "content",
+    "content": "content",
+    "pubDate": "published",
+    "published": "published",
+    "date": "published",
+    "updated": "updated",
+    "origLink": "feedburner_origlink",
+}
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(value: str) -> Optional[time.struct_time]:
+    """
+    RFC 822 (RSS) or ISO 8601 (Atom) date as a UTC struct_time,
+    matching feedparser's *_parsed fields.
+    """
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).timetuple()
+
+
+def _build_entry(element: ET.Element) -> feedparser.FeedParserDict:
+    """
+    Map an <item>/<entry> element to the feedparser entry fields the
+    ingestion pipeline reads.
+    """
+    entry = feedparser.FeedParserDict()
+
+    for child in element:
+        name = _local_name(child.tag)
+
+        # Atom links live in attributes; only the alternate link is the article
+        if name == "link" and child.get("href"):
+            if child.get("rel", "alternate") == "alternate":
+                entry.setdefault("link", child.get("href"))
+            continue
+
+        key = FIELD_TAGS.get(name)
+        if key is None:
+            continue
+
+        text = "".join(child.itertext()).strip()
+        if text:
+            entry.setdefault(key, text)
+
+    # RSS items may only carry a permalink guid
+    if "link" not in entry and entry.get("id", "").startswith("http"):
+        entry["link"] = entry["id"]
+    # feedparser exposes content as a list of dicts; only use it as summary
+    content = entry.pop("content", None)
+    if "summary" not in entry and content:
+        entry["summary"] = content
+
+    for key in ("published", "updated"):
+        if key in entry:
+            entry[f"{key}_parsed"] = _parse_date(entry[key])
+    if not entry.get("published_parsed") and entry.get("updated_parsed"):
+        entry["published_parsed"] = entry["updated_parsed"]
+
+    return entry
+
+
+async def iter_feed_entries(
+    response: httpx.Response, max_bytes: int, deadline: float
+) -> AsyncIterator[feedparser.FeedParserDict]:
+    """
+    Parse the response body incrementally and yield entries as soon as
+    their closing tag arrives. Stops quietly at the size or time limit.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parents = []
+    received = 0
+
+    async for chunk in response.aiter_bytes():
+        received += len(chunk)
+        if received > max_bytes:
+            logger.warning(f" Feed exceeds {max_bytes} bytes, stopping: {response.url}")
+            return
+        if time.monotonic() > deadline:
+            logger.warning(f" Feed parse timed out, stopping: {response.url}")
+            return
+
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                parents.append(element)
+                continue
+
+            parents.pop()
+            if _local_name(element.tag) in ENTRY_TAGS:
+                yield _build_entry(element)
+
+                # Drop the parsed entry so memory stays flat on large feeds
+                if parents:
+                    parents[-1].remove(element)
+
+
+async def fetch_feed(
+    url: str,
+    etag: Optional[str] = None,
+    modified: Optional[str] = None,
+    request_headers: Optional[Dict[str, str]] = None,
+    max_entries: Optional[int] = None,
+) -> feedparser.FeedParserDict:
+    """
+    Streaming alternative to feedparser.parse: conditional GET, then read
+    only as much of the body as the first max_entries entries need.
+
+    Returns a FeedParserDict with status, etag, modified and entries, so
+    callers can use either parser interchangeably. Raises
+    xml.etree.ElementTree.ParseError on malformed XML.
+    """
+    max_entries = max_entries or settings.FEED_MAX_ENTRIES
+    deadline = time.monotonic() + settings.FEED_PARSE_TIMEOUT_SECONDS
+
+    headers = dict(request_headers or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+
+    feed = feedparser.FeedParserDict(entries=[])
+
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=settings.FEED_PARSE_TIMEOUT_SECONDS,
+    ) as client:
+        async with client.stream("GET", url, headers=headers) as response:
+            feed["status"] = response.status_code
+            if response.status_code == 304:
+                return feed
+            response.raise_for_status()
+
+            feed["etag"] = response.headers.get("etag")
+            feed["modified"] = response.headers.get("last-modified")
+
+            async with aclosing(
+                iter_feed_entries(response, settings.FEED_MAX_BYTES, deadline)
+            ) as entries:
+                async for entry in entries:
+                    feed["entries"].append(entry)
+                    if len(feed["entries"]) >= max_entries:
+                        # Leaving the stream closes the connection early
+                        break
+
+    return feed
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.db.models import Source
+
+
+def clamp_interval(minutes: float) -> int:
+    return int(min(
+        max(minutes, settings.FETCH_INTERVAL_MIN_MINUTES),
+        settings.FETCH_INTERVAL_MAX_MINUTES,
+    ))
+
+
+def plan_next_fetch(
+    source: Source, new_items: int, now: Optional[datetime] = None
+) -> Tuple[float, int, datetime]:
+    """
+    Update the source's new-items-per-hour estimate (EWMA over fetches)
+    and pick the interval at which a fetch should find about
+    FETCH_TARGET_NEW_ITEMS new items, within the configured bounds.
+
+    Returns (new_item_rate, fetch_interval_minutes, next_fetch_at).
+    """
+    now = now or datetime.now(timezone.utc)
+    last_fetched = source.last_fetched
+    if last_fetched is not None and last_fetched.tzinfo is None:
+        last_fetched = last_fetched.replace(tzinfo=timezone.utc)
+
+    interval = source.fetch_interval_minutes or settings.FETCH_INTERVAL_DEFAULT_MINUTES
+    if last_fetched is not None:
+        elapsed_hours = max((now - last_fetched).total_seconds() / 3600, 1 / 60)
+    else:
+        elapsed_hours = interval / 60
+    observed_rate = new_items / elapsed_hours
+
+    if source.new_item_rate is None:
+        rate = observed_rate
+    else:
+        alpha = settings.FETCH_RATE_EWMA_ALPHA
+        rate = alpha * observed_rate + (1 - alpha) * source.new_item_rate
+
+    if rate > 0:
+        interval = clamp_interval(settings.FETCH_TARGET_NEW_ITEMS / rate * 60)
+    else:
+        interval = settings.FETCH_INTERVAL_MAX_MINUTES
+
+    return rate, interval, now + timedelta(minutes=interval)
+
+
+def plan_retry(source: Source, now: Optional[datetime] = None) -> datetime:
+    """
+    Next attempt after a failed fetch: keep the current interval so a
+    broken feed is not retried on every scheduler tick.
+    """
+    now = now or datetime.now(timezone.utc)
+    interval = source.fetch_interval_minutes or settings.FETCH_INTERVAL_DEFAULT_MINUTES
+    return now + timedelta(minutes=interval)
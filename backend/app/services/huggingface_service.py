@@ -1,38 +1,58 @@
 import logging
 import asyncio
-import time
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Optional, Dict, Any, Tuple
 from functools import wraps
 
-import requests
-from sentence_transformers import SentenceTransformer
+import httpx
+import numpy as np
 
+from app.core.cache import LRUCache
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.rate_limit import AcquireAborted, AsyncTokenBucket
+from app.services.analysis_cache import AnalysisCache
+from app.services.embedding_backends import (
+    EmbeddingBackend,
+    create_embedding_backend,
+)
+from app.services.embedding_pool import EmbeddingProcessPool
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 # --------------------------------------------------
 # Rate limiting decorator
 # --------------------------------------------------
-def rate_limit(max_calls_per_minute: int):
-    min_interval = 60.0 / max_calls_per_minute
-    last_called = [0.0]
-
+def rate_limit(limiter: AsyncTokenBucket, abort: Optional[asyncio.Event] = None):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_called[0]
-            wait_for = min_interval - elapsed
-            if wait_for > 0:
-                await asyncio.sleep(wait_for)
-            result = await func(*args, **kwargs)
-            last_called[0] = time.time()
-            return result
+            async with limiter.acquire(abort):
+                return await func(*args, **kwargs)
         return wrapper
     return decorator
 
 
+hf_rate_limiter = AsyncTokenBucket(
+    settings.MAX_REQUESTS_PER_MINUTE,
+    burst=settings.HF_RATE_LIMIT_BURST,
+    max_in_flight=settings.HF_MAX_IN_FLIGHT,
+)
+
+hf_circuit = CircuitBreaker(
+    settings.HF_CIRCUIT_FAILURE_THRESHOLD,
+    settings.HF_CIRCUIT_COOLDOWN_SECONDS,
+    probe_timeout_seconds=settings.HF_HTTP_TIMEOUT,
+)
+
+
 # --------------------------------------------------
 # Hugging Face Service
 # --------------------------------------------------
@@ -51,39 +71,214 @@ class HuggingFaceService:
             "Content-Type": "application/json",
         }
 
+        self.analysis_cache = AnalysisCache(self.model_id)
+        self.query_embedding_cache = LRUCache(
+            maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        )
+
+        # Shared keep-alive client, created on first use inside the event loop
+        self._http_client: Optional[httpx.AsyncClient] = None
+
         # --------------------------------------------------
-        # Load local embedding model (preferred path)
+        # Local embedding model (preferred path), loaded lazily so that
+        # importing this module stays cheap; the API warms it in the
+        # background during startup.
         # --------------------------------------------------
         self.use_local_embeddings = False
-        self.embedding_model: Optional[SentenceTransformer] = None
+        self.embedding_backend: Optional[EmbeddingBackend] = None
+        self.embedding_pool: Optional[EmbeddingProcessPool] = None
+        self.embedding_model_state = "not_loaded"
+        self._embedding_model_lock = asyncio.Lock()
 
-        try:
-            logger.info(
-                f"Loading local embedding model: {self.embedding_model_name}"
-            )
-            self.embedding_model = SentenceTransformer(
-                self.embedding_model_name
-            )
-            self.use_local_embeddings = True
-            logger.info(" Local embedding model loaded successfully")
-        except Exception as e:
-            logger.error(
-                f" Failed to load local embedding model: {e}"
+    # --------------------------------------------------
+    # Embedding model loading
+    # --------------------------------------------------
+    def _load_embedding_model(self) -> EmbeddingBackend:
+        return create_embedding_backend(
+            settings.EMBEDDING_BACKEND, self.embedding_model_name
+        )
+
+    async def ensure_embedding_model(self) -> bool:
+        """
+        Loads the embedding model once. Returns True when it is usable.
+        While another caller is loading it, returns False at once so
+        searches fall back to keyword matching instead of waiting.
+        """
+        if self.embedding_model_state in ("ready", "failed"):
+            return self.use_local_embeddings
+        if self.embedding_model_state == "loading":
+            return False
+
+        async with self._embedding_model_lock:
+            if self.embedding_model_state == "not_loaded":
+                self.embedding_model_state = "loading"
+                try:
+                    logger.info(
+                        f"Loading local embedding model: {self.embedding_model_name} "
+                        f"({settings.EMBEDDING_BACKEND})"
+                    )
+                    if settings.EMBEDDING_WORKERS > 0:
+                        self.embedding_pool = EmbeddingProcessPool(
+                            settings.EMBEDDING_WORKERS,
+                            settings.EMBEDDING_BACKEND,
+                            self.embedding_model_name,
+                            settings.EMBEDDING_DIMENSION,
+                        )
+                        await self.embedding_pool.start()
+                    else:
+                        self.embedding_backend = await asyncio.to_thread(
+                            self._load_embedding_model
+                        )
+                    self.use_local_embeddings = True
+                    self.embedding_model_state = "ready"
+                    logger.info(" Local embedding model loaded successfully")
+                except Exception as e:
+                    self.embedding_model_state = "failed"
+                    logger.error(
+                        f" Failed to load local embedding model: {e}"
+                    )
+                    logger.warning("Embeddings will be skipped if generation fails")
+                finally:
+                    # Cancelled mid-load: let the next caller try again
+                    if self.embedding_model_state == "loading":
+                        self.embedding_model_state = "not_loaded"
+
+        return self.use_local_embeddings
+
+    @property
+    def is_ready(self) -> bool:
+        return self.embedding_model_state == "ready"
+
+    async def _encode(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Encodes on the worker process pool when configured, otherwise on
+        the default thread pool.
+        """
+        batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        if self.embedding_pool is not None:
+            return await self.embedding_pool.encode(texts, batch_size)
+        return await asyncio.to_thread(
+            self.embedding_backend.encode, texts, batch_size
+        )
+
+    # --------------------------------------------------
+    # Pooled HTTP client
+    # --------------------------------------------------
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                headers=self.headers,
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(
+                    settings.HF_HTTP_TIMEOUT,
+                    connect=settings.HF_HTTP_CONNECT_TIMEOUT,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.HF_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=(
+                        settings.HF_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                    ),
+                ),
             )
-            logger.warning("Embeddings will be skipped if generation fails")
+        return self._http_client
+
+    async def aclose(self):
+        """
+        Close the pooled HTTP client and embedding workers
+        (called on application shutdown).
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+        if self.embedding_pool is not None:
+            self.embedding_pool.shutdown()
 
     # --------------------------------------------------
     # News analysis (HF Inference API)
     # --------------------------------------------------
-    @rate_limit(settings.MAX_REQUESTS_PER_MINUTE)
     async def analyze_news_item(
         self, title: str, content: str
     ) -> Dict[str, Any]:
         """
         Uses Hugging Face text-generation model to analyze news.
+        Results are cached by model and normalized input; fallback
+        results are never cached so they get retried later.
+        """
+        cache_key = self.analysis_cache.make_key(title, content)
+        cached = await self.analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = await self._request_analysis(title, content)
+        if result is None:
+            return self._fallback_analysis(title, content)
+        if result.get("needs_reanalysis"):
+            return result
+
+        await self.analysis_cache.set(cache_key, result)
+        return result
+
+    async def analyze_news_batch(
+        self, items: List[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyzes many (title, content) pairs concurrently; the rate
+        limiter bounds how many requests are in flight. With
+        ANALYSIS_MICRO_BATCH_SIZE > 1, short articles are packed several
+        to a prompt. Output is aligned with input.
         """
+        keys = [
+            self.analysis_cache.make_key(title, content)
+            for title, content in items
+        ]
+        # One bulk lookup instead of a DB session per item
+        cached = await self.analysis_cache.get_many(keys)
+        results: List[Optional[Dict[str, Any]]] = [cached.get(key) for key in keys]
+        misses = [index for index, result in enumerate(results) if result is None]
+
+        # Long articles would crowd the shared prompt; send them alone
+        batch_size = max(1, settings.ANALYSIS_MICRO_BATCH_SIZE)
+        short = [
+            index for index in misses
+            if batch_size > 1
+            and len(items[index][1]) <= settings.ANALYSIS_MICRO_BATCH_MAX_CHARS
+        ]
+        groups = [short[start:start + batch_size]
+                  for start in range(0, len(short), batch_size)]
+        batched = set(short)
+        groups += [[index] for index in misses if index not in batched]
+        fresh: Dict[str, Dict[str, Any]] = {}
+
+        async def analyze_group(group: List[int]):
+            if len(group) == 1:
+                title, content = items[group[0]]
+                answers = [await self._request_analysis(title, content)]
+            else:
+                answers = await self._request_batch_analysis(
+                    [items[index] for index in group]
+                )
 
-        prompt = f"""
+            for index, answer in zip(group, answers):
+                title, content = items[index]
+                if answer is None:
+                    results[index] = self._fallback_analysis(title, content)
+                elif answer.get("needs_reanalysis"):
+                    # Unparseable answer: fallback, never cached
+                    results[index] = answer
+                else:
+                    results[index] = answer
+                    fresh[keys[index]] = answer
+
+        await asyncio.gather(*[analyze_group(group) for group in groups])
+        await self.analysis_cache.set_many(fresh)
+        return results
+
+    def _analysis_prompt(self, title: str, content: str) -> str:
+        return f"""
 Analyze the following AI news article.
 
 Title:
@@ -100,41 +295,157 @@ SENTIMENT: Positive | Neutral | Negative
 CATEGORY: Research | Product | Business | Policy | Other
 """
 
+    def _batch_analysis_prompt(self, items: List[Tuple[str, str]]) -> str:
+        articles = "\n".join(
+            f"ARTICLE {number}:\nTitle: {title}\nContent: {content[:1200]}\n"
+            for number, (title, content) in enumerate(items, start=1)
+        )
+        return f"""
+Analyze each of the following {len(items)} AI news articles separately.
+
+{articles}
+For EACH article return STRICTLY this block, in order:
+
+ARTICLE <number>
+SUMMARY: <2 sentence summary>
+IMPACT: <0-100>
+SENTIMENT: Positive | Neutral | Negative
+CATEGORY: Research | Product | Business | Policy | Other
+"""
+
+    async def _request_analysis(
+        self, title: str, content: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Analyzes one article. Returns None when the call fails.
+        """
+        generated = await self._generate(self._analysis_prompt(title, content))
+        if generated is None:
+            return None
+
+        return self._parse_analysis_response(generated, title, content)
+
+    async def _request_batch_analysis(
+        self, items: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyzes several short articles in one call and splits the answer
+        per article. Articles missing from the answer are retried alone;
+        if the call itself fails every entry is None.
+        """
+        generated = await self._generate(
+            self._batch_analysis_prompt(items),
+            max_new_tokens=200 * len(items),
+        )
+        if generated is None:
+            return [None] * len(items)
+
+        blocks: Dict[int, List[str]] = {}
+        number = None
+        for line in generated.splitlines():
+            match = re.match(r"\s*\**\s*ARTICLE\s+(\d+)", line, re.IGNORECASE)
+            if match:
+                number = int(match.group(1))
+                blocks[number] = []
+            elif number is not None:
+                blocks[number].append(line)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        retries = []
+        for number, (title, content) in enumerate(items, start=1):
+            block = "\n".join(blocks.get(number, []))
+            if "IMPACT:" in block or "SUMMARY:" in block:
+                results[number - 1] = self._parse_analysis_response(
+                    block, title, content
+                )
+            else:
+                logger.warning(f"Batch answer missing article, retrying alone: {title[:60]}")
+                retries.append(number - 1)
+
+        answers = await asyncio.gather(
+            *[self._request_analysis(*items[index]) for index in retries]
+        )
+        for index, answer in zip(retries, answers):
+            results[index] = answer
+
+        return results
+
+    async def _generate(
+        self, prompt: str, max_new_tokens: int = 200
+    ) -> Optional[str]:
+        """
+        Calls the inference API through the circuit breaker. Returns None
+        when the call fails or the circuit is open, so callers fall back
+        immediately instead of waiting on timeouts.
+        """
+        if not hf_circuit.allow():
+            return None
+
+        try:
+            generated, healthy = await self._call_inference_api(
+                prompt, max_new_tokens
+            )
+        except AcquireAborted:
+            # Circuit opened while queued: no slot or token was used
+            hf_circuit.release_probe()
+            return None
+        except asyncio.CancelledError:
+            hf_circuit.release_probe()
+            raise
+        except Exception:
+            hf_circuit.record_failure()
+            raise
+
+        if healthy:
+            hf_circuit.record_success()
+        else:
+            was_open = hf_circuit.state == CircuitBreaker.OPEN
+            hf_circuit.record_failure()
+            if not was_open and hf_circuit.state == CircuitBreaker.OPEN:
+                logger.warning("HF circuit open, using fallback analysis")
+        return generated
+
+    @rate_limit(hf_rate_limiter, abort=hf_circuit.opened)
+    async def _call_inference_api(
+        self, prompt: str, max_new_tokens: int
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Returns (generated_text, healthy). healthy is False for timeouts,
+        429 and 5xx. Raises AcquireAborted if the circuit opens while the
+        call waits for the rate limiter.
+        """
         try:
-            response = await asyncio.to_thread(
-                requests.post,
+            response = await self._get_http_client().post(
                 self.api_url,
-                headers=self.headers,
                 json={
                     "inputs": prompt,
                     "parameters": {
-                        "max_new_tokens": 200,
+                        "max_new_tokens": max_new_tokens,
                         "temperature": 0.3,
+                        # Parse only the answer, never the echoed prompt template
+                        "return_full_text": False,
                     },
                 },
-                timeout=30,
             )
 
             if response.status_code != 200:
                 logger.error(
                     f"HF API error {response.status_code}: {response.text}"
                 )
-                return self._fallback_analysis(title, content)
+                # Other 4xx are request problems, not an unavailable service
+                return None, not (
+                    response.status_code == 429 or response.status_code >= 500
+                )
 
             data = response.json()
 
             if isinstance(data, list) and data:
-                generated = data[0].get("generated_text", "")
-            else:
-                generated = data.get("generated_text", "")
-
-            return self._parse_analysis_response(
-                generated, title, content
-            )
+                return data[0].get("generated_text", ""), True
+            return data.get("generated_text", ""), True
 
         except Exception as e:
             logger.error(f"HF analysis failed: {e}")
-            return self._fallback_analysis(title, content)
+            return None, False
 
     # --------------------------------------------------
     # Parse structured LLM output
@@ -227,6 +538,8 @@ CATEGORY: Research | Product | Business | Policy | Other
             "impact_score": impact,
             "sentiment": sentiment,
             "category_cluster": category,
+            # Picked up by the re-analysis job once the API is healthy
+            "needs_reanalysis": True,
         }
 
     # --------------------------------------------------
@@ -240,23 +553,80 @@ CATEGORY: Research | Product | Business | Policy | Other
         Returns None on failure (DO NOT store junk vectors).
         """
 
-        if not self.use_local_embeddings or not self.embedding_model:
+        if not await self.ensure_embedding_model():
             logger.warning("Local embedding model not available")
             return None
 
         try:
-            vector = await asyncio.to_thread(
-                self.embedding_model.encode,
-                text,
-                convert_to_tensor=False,
-                normalize_embeddings=True,
-            )
-            return vector.tolist()
+            vectors = await self._encode([text])
+            return vectors[0].tolist()
 
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             return None
 
+    async def generate_query_embedding(
+        self, query: str
+    ) -> Optional[List[float]]:
+        """
+        Embeds a search query, reusing vectors for repeated queries.
+        """
+        key = " ".join(query.lower().split())
+
+        vector = self.query_embedding_cache.get(key)
+        if vector is not None:
+            return vector
+
+        vector = await self.generate_embedding(key)
+        if vector:
+            self.query_embedding_cache.set(key, vector)
+        return vector
+
+    async def generate_embeddings(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> List[Optional[List[float]]]:
+        """
+        Generates embeddings for many texts using batched encode calls.
+        Output is aligned with input; failed batches yield None entries.
+        """
+
+        if not texts:
+            return []
+
+        if not await self.ensure_embedding_model():
+            logger.warning("Local embedding model not available")
+            return [None] * len(texts)
+
+        batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        batches = [
+            texts[start:start + batch_size]
+            for start in range(0, len(texts), batch_size)
+        ]
+
+        if self.embedding_pool is not None:
+            # Spread batches across worker processes
+            results = await asyncio.gather(
+                *[self._encode(batch, batch_size) for batch in batches],
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for batch in batches:
+                try:
+                    results.append(await self._encode(batch, batch_size))
+                except Exception as e:
+                    results.append(e)
+
+        vectors: List[Optional[List[float]]] = []
+        for batch, encoded in zip(batches, results):
+            if isinstance(encoded, BaseException):
+                logger.error(f"Batch embedding generation failed: {encoded}")
+                vectors.extend([None] * len(batch))
+            else:
+                vectors.extend(vector.tolist() for vector in encoded)
+
+        return vectors
+
 
 # --------------------------------------------------
 # Singleton instance
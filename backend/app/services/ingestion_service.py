@@ -1,12 +1,28 @@
 import feedparser
 import asyncio
-from sqlalchemy.orm import Session
-from datetime import datetime
-from time import mktime
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from datetime import datetime, timedelta, timezone
+from calendar import timegm
 import logging
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.leadership import advisory_leadership
 from app.db.models import NewsItem, Source
-from app.services.huggingface_service import hf_service
+from app.services import feed_stream
+from app.services.fetch_scheduler import plan_next_fetch, plan_retry
+from app.services.huggingface_service import hf_circuit, hf_service
+from app.services.normalization import canonicalize_url, title_fingerprint
+from app.services.semantic_dedup import RecentEmbeddingIndex, recent_embeddings
+from app.services.stats_service import (
+    dashboard_stats,
+    news_stats_deltas,
+    stats_entry,
+)
 from app.db import crud
 
 logger = logging.getLogger(__name__)
@@ -16,132 +32,525 @@ RSS_HEADERS = {
     "User-Agent": "Mozilla/5.0 (AI News Dashboard; +https://localhost)"
 }
 
+# Canonical URLs known to be stored, shared across cycles to skip DB lookups
+recent_urls = LRUCache(maxsize=settings.RECENT_URL_CACHE_SIZE)
+
+
+def apply_analysis(
+    news_item: NewsItem, analysis: dict, raw_text: Optional[str] = None
+):
+    news_item.summary = analysis.get("summary")
+    news_item.impact_score = analysis.get("impact_score", 50)
+    news_item.sentiment = analysis.get("sentiment", "Neutral")
+    news_item.category_cluster = analysis.get("category_cluster", "General")
+    news_item.needs_reanalysis = analysis.get("needs_reanalysis", False)
+
+    # Keep the full input only while the item may be re-analysed
+    if not news_item.needs_reanalysis:
+        news_item.analysis_input = None
+    elif raw_text is not None:
+        news_item.analysis_input = raw_text
+
 
 class IngestionService:
-    def __init__(self, db: Session):
-        self.db = db
+    """
+    Each source is fetched and saved with its own short-lived session, so
+    a failing feed can only roll back its own work.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.session_factory = session_factory
+        # New feed validators, saved only once the feed's entries are stored
+        self.feed_validators: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        # Sources with entries that could not be processed this cycle
+        self.incomplete_sources: Set[int] = set()
+        self.source_slots = asyncio.Semaphore(
+            settings.INGESTION_MAX_CONCURRENT_SOURCES
+        )
+
+    async def filter_new_entries(
+        self, db: AsyncSession, entries: list
+    ) -> List[Tuple[dict, str, str, Optional[str]]]:
+        """
+        Drop entries already stored under the same canonical URL or, within
+        TITLE_DEDUP_WINDOW_DAYS, the same title fingerprint. Uses the recent
+        URL cache first and a single bulk query for the remaining keys.
+
+        Returns (entry, link, canonical_url, title_fingerprint) tuples.
+        """
+        candidates = []
+        seen = set()
+        for entry in entries:
+            # Basic validation
+            if not hasattr(entry, "link") or not hasattr(entry, "title"):
+                continue
+
+            # Feed proxies (FeedBurner) expose the publisher's link separately
+            link = entry.get("feedburner_origlink") or entry.link
+            canonical_url = canonicalize_url(link)
+            fingerprint = title_fingerprint(entry.title)
+
+            if canonical_url in seen or canonical_url in recent_urls:
+                continue
+            if fingerprint and fingerprint in seen:
+                continue
+            seen.add(canonical_url)
+            if fingerprint:
+                seen.add(fingerprint)
+            candidates.append((entry, link, canonical_url, fingerprint))
+
+        existing_urls, existing_fingerprints = await crud.get_existing_news_keys(
+            db,
+            [canonical_url for _, _, canonical_url, _ in candidates],
+            [fingerprint for _, _, _, fingerprint in candidates if fingerprint],
+            since=datetime.now(timezone.utc)
+            - timedelta(days=settings.TITLE_DEDUP_WINDOW_DAYS),
+        )
+        for url in existing_urls:
+            recent_urls.set(url)
 
-    async def fetch_and_process_feed(self, source: Source):
+        return [
+            candidate for candidate in candidates
+            if candidate[2] not in existing_urls
+            and candidate[3] not in existing_fingerprints
+        ]
+
+    def drop_duplicate_keys(
+        self, pending: List[Tuple[NewsItem, str]]
+    ) -> List[Tuple[NewsItem, str]]:
+        """
+        The same article may be listed by more than one feed in a cycle:
+        keep the first item for each canonical URL and title fingerprint.
+        """
+        seen = set()
+        unique: List[Tuple[NewsItem, str]] = []
+        for news_item, raw_text in pending:
+            keys = {news_item.canonical_url, news_item.title_fingerprint} - {None}
+            if keys & seen:
+                logger.info(f" Duplicate skipped: {news_item.title[:60]}")
+                continue
+            seen |= keys
+            unique.append((news_item, raw_text))
+
+        return unique
+
+    async def fetch_feed(self, source: Source) -> feedparser.FeedParserDict:
+        """
+        Conditional feed request with the configured parser. Feeds the
+        streaming parser cannot read (malformed XML, undeclared HTML
+        entities) are retried with feedparser.
+        """
+        if settings.FEED_PARSER_MODE == "streaming":
+            try:
+                return await feed_stream.fetch_feed(
+                    source.url,
+                    etag=source.etag,
+                    modified=source.last_modified,
+                    request_headers=RSS_HEADERS,
+                )
+            except ET.ParseError as parse_error:
+                logger.warning(
+                    f" Streaming parse failed for {source.name} ({parse_error}), "
+                    f"retrying with feedparser"
+                )
+
+        # IMPORTANT: feedparser must receive headers
+        return await asyncio.to_thread(
+            feedparser.parse,
+            source.url,
+            etag=source.etag,
+            modified=source.last_modified,
+            request_headers=RSS_HEADERS
+        )
+
+    async def fetch_and_process_feed(
+        self, source: Source
+    ) -> Optional[List[Tuple[NewsItem, str]]]:
         """
-        Fetch a single RSS feed, deduplicate, analyze, embed, and store.
+        Fetch a single RSS feed and stage its new entries.
+
+        Returns the new (unsaved, unanalyzed) items paired with their raw
+        text, or None when the feed could not be fetched. Embedding,
+        duplicate suppression, analysis and storage happen once per cycle
+        in run_ingestion_cycle.
         """
         logger.info(f" Fetching {source.name}...")
 
         try:
-            # IMPORTANT: feedparser must receive headers
-            feed = await asyncio.to_thread(
-                feedparser.parse,
-                source.url,
-                request_headers=RSS_HEADERS
-            )
+            feed = await self.fetch_feed(source)
+
+            # Feed unchanged since the last fetch: nothing to parse
+            if feed.get("status") == 304:
+                logger.info(f" {source.name}: Not modified")
+                return []
+
+            # Persisted with the fetch stats once the cycle is saved
+            self.feed_validators[source.id] = (feed.get("etag"), feed.get("modified"))
 
             if not feed.entries:
                 logger.warning(f" No entries found for {source.name}")
-                return
+                return None
 
-            processed_count = 0
+            pending: List[Tuple[NewsItem, str]] = []
 
-            for entry in feed.entries[:10]:  # Limit to latest 10
-                try:
-                    # Basic validation
-                    if not hasattr(entry, "link") or not hasattr(entry, "title"):
-                        continue
-
-                    # 1. Deduplication
-                    exists = (
-                        self.db.query(NewsItem)
-                        .filter(NewsItem.url == entry.link)
-                        .first()
-                    )
-                    if exists:
-                        continue
+            # 1. Deduplication (limit to latest FEED_MAX_ENTRIES)
+            async with self.session_factory() as db:
+                entries = await self.filter_new_entries(
+                    db, feed.entries[:settings.FEED_MAX_ENTRIES]
+                )
 
+            for entry, link, canonical_url, fingerprint in entries:
+                try:
                     # 2. Prepare text
                     summary = entry.get("summary", "")
                     raw_text = f"{entry.title}. {summary}"
 
-                    # 3. AI analysis
-                    analysis = await hf_service.analyze_news_item(
-                        entry.title,
-                        raw_text
-                    )
-
-                    # 4. Embedding
-                    embedding = await hf_service.generate_embedding(raw_text)
-                    if not embedding:
-                        logger.warning(f" No embedding generated: {entry.title}")
-                        continue
-
-                    # 5. Parse published date safely
-                    published_at = datetime.utcnow()
+                    # 3. Parse published date safely
+                    published_at = datetime.now(timezone.utc)
                     if getattr(entry, "published_parsed", None):
                         try:
+                            # published_parsed is UTC; mktime would read it as local
                             published_at = datetime.fromtimestamp(
-                                mktime(entry.published_parsed)
+                                timegm(entry.published_parsed), timezone.utc
                             )
                         except Exception:
                             pass
 
-                    # 6. Save
+                    # 4. Stage for batched embedding and analysis
                     news_item = NewsItem(
                         source_id=source.id,
                         title=entry.title,
-                        url=entry.link,
+                        url=link,
+                        canonical_url=canonical_url,
+                        title_fingerprint=fingerprint,
                         published_at=published_at,
-                        summary=analysis.get("summary"),
-                        impact_score=analysis.get("impact_score", 50),
-                        sentiment=analysis.get("sentiment", "Neutral"),
-                        category_cluster=analysis.get("category_cluster", "General"),
-                        embedding=embedding,
-                    )
-
-                    self.db.add(news_item)
-                    processed_count += 1
-
-                    logger.info(
-                        f" Saved: {entry.title[:60]} "
-                        f"(Impact: {analysis.get('impact_score', 50)})"
                     )
+                    pending.append((news_item, raw_text))
 
                 except Exception as entry_error:
                     logger.error(
                         f" Error processing entry from {source.name}: {entry_error}"
                     )
+                    self.incomplete_sources.add(source.id)
                     continue
 
-            self.db.commit()
+            return pending
+
+        except Exception as feed_error:
+            logger.error(f" Failed to fetch {source.name}: {feed_error}")
+            return None
+
+    async def embed_pending_items(
+        self, pending: List[Tuple[NewsItem, str]]
+    ) -> List[Tuple[NewsItem, str]]:
+        """
+        Embed all staged items in batched encode calls and attach the
+        vectors. Items without an embedding are dropped.
+        """
+        embeddings = await hf_service.generate_embeddings(
+            [raw_text for _, raw_text in pending]
+        )
+
+        embedded: List[Tuple[NewsItem, str]] = []
+        for (news_item, raw_text), embedding in zip(pending, embeddings):
+            if not embedding:
+                logger.warning(f" No embedding generated: {news_item.title}")
+                self.incomplete_sources.add(news_item.source_id)
+                continue
+
+            news_item.embedding = embedding
+            embedded.append((news_item, raw_text))
+
+        return embedded
+
+    async def suppress_near_duplicates(
+        self, embedded: List[Tuple[NewsItem, str]]
+    ) -> List[Tuple[NewsItem, str]]:
+        """
+        Drop items whose embedding is nearly identical to a recent stored
+        item or to an earlier item of this cycle (syndicated copies of
+        the same story), so they never reach the analysis model.
+
+        Survivors join the shared index only once they are saved (see
+        save_source_items); skipped URLs are remembered so later fetches
+        neither re-embed them nor count them as new entries.
+        """
+        if not settings.SEMANTIC_DEDUP_ENABLED or not embedded:
+            return embedded
+
+        async with self.session_factory() as db:
+            await recent_embeddings.refresh(db)
+
+        # Items accepted earlier in this cycle, not yet stored
+        cycle_embeddings = RecentEmbeddingIndex()
+
+        unique: List[Tuple[NewsItem, str]] = []
+        for news_item, raw_text in embedded:
+            duplicate = (
+                recent_embeddings.find_duplicate(news_item.embedding)
+                or cycle_embeddings.find_duplicate(news_item.embedding)
+            )
+            if duplicate:
+                title, similarity = duplicate
+                recent_urls.set(news_item.canonical_url)
+                logger.info(
+                    f" Near-duplicate skipped: {news_item.title[:60]} "
+                    f"(matches '{title[:60]}', similarity {similarity:.3f})"
+                )
+                continue
+
+            cycle_embeddings.add(news_item.title, news_item.embedding)
+            unique.append((news_item, raw_text))
+
+        return unique
+
+    async def analyze_pending_items(self, staged: List[Tuple[NewsItem, str]]):
+        """
+        Run AI analysis on all staged items of the cycle at once, so
+        requests from every source share the in-flight limit, and fill
+        in their fields.
+        """
+        try:
+            analyses = await hf_service.analyze_news_batch(
+                [(news_item.title, raw_text) for news_item, raw_text in staged]
+            )
+        except Exception as analysis_error:
+            logger.error(f" Analysis failed: {analysis_error}")
+            analyses = [
+                hf_service._fallback_analysis(news_item.title, raw_text)
+                for news_item, raw_text in staged
+            ]
+
+        for (news_item, raw_text), analysis in zip(staged, analyses):
+            apply_analysis(news_item, analysis, raw_text)
+
+    async def save_source_items(
+        self, source: Source, news_items: List[NewsItem], new_entries: int
+    ):
+        """
+        Store one source's items, fetch stats and next fetch time in its
+        own session. new_entries counts the feed's unseen entries before
+        semantic dedup, i.e. its publishing rate.
+        """
+        rate, interval, next_fetch_at = plan_next_fetch(source, new_entries)
+
+        # Keep the old validators if entries were dropped, so the next
+        # fetch gets the full feed instead of a 304 and retries them
+        etag, last_modified = source.etag, source.last_modified
+        if source.id not in self.incomplete_sources:
+            etag, last_modified = self.feed_validators.get(
+                source.id, (etag, last_modified)
+            )
 
-            # Update source fetch stats
-            crud.update_source_fetch_stats(self.db, source.id)
+        async with self.session_factory() as db:
+            try:
+                db.add_all(news_items)
+                await crud.add_news_stats(
+                    db, news_stats_deltas(added=map(stats_entry, news_items))
+                )
+                if news_items:
+                    await crud.bump_cache_generation(db, "news")
+                await db.commit()
 
+                for news_item in news_items:
+                    recent_embeddings.add(news_item.title, news_item.embedding)
+
+                # Update source fetch stats
+                await crud.update_source_fetch_stats(
+                    db,
+                    source.id,
+                    etag=etag,
+                    last_modified=last_modified,
+                    new_item_rate=rate,
+                    fetch_interval_minutes=interval,
+                    next_fetch_at=next_fetch_at,
+                )
+
+            except Exception as save_error:
+                logger.error(f" Failed to save {source.name}: {save_error}")
+                await db.rollback()
+                return
+
+        if news_items:
+            dashboard_stats.invalidate()
+
+        for news_item in news_items:
+            recent_urls.set(news_item.canonical_url)
             logger.info(
-                f" {source.name}: Processed {processed_count} new items"
+                f" Saved: {news_item.title[:60]} "
+                f"(Impact: {news_item.impact_score})"
             )
 
-        except Exception as feed_error:
-            logger.error(f" Failed to fetch {source.name}: {feed_error}")
-            self.db.rollback()
+        logger.info(
+            f" {source.name}: Processed {len(news_items)} new items "
+            f"(next fetch in {interval} min)"
+        )
+
+    async def defer_failed_sources(self, sources: List[Source]):
+        async with self.session_factory() as db:
+            for source in sources:
+                await crud.defer_source_fetch(db, source.id, plan_retry(source))
 
-    async def run_ingestion_cycle(self):
+    async def process_source(
+        self, source: Source
+    ) -> Optional[List[Tuple[NewsItem, str]]]:
+        async with self.source_slots:
+            return await self.fetch_and_process_feed(source)
+
+    async def run_ingestion_cycle(self, due_only: bool = True):
         """
-        Run ingestion for all active sources.
+        Run ingestion for active sources whose next fetch is due
+        (or all active sources when due_only is False), unless another
+        worker or replica is already running a cycle.
         """
+        async with advisory_leadership(
+            self.session_factory, settings.INGESTION_LOCK_ID
+        ) as leader:
+            if not leader:
+                logger.info(" Ingestion cycle running elsewhere, skipping")
+                return
+
+            await self._run_cycle(due_only)
+
+    async def _run_cycle(self, due_only: bool):
         logger.info(" Starting ingestion cycle...")
 
-        sources = (
-            self.db.query(Source)
-            .filter(Source.is_active.is_(True))
-            .all()
-        )
+        # Sources stay usable after close; each stage opens its own session
+        async with self.session_factory() as db:
+            if due_only:
+                sources = await crud.get_due_sources(db, datetime.now(timezone.utc))
+            else:
+                sources = await crud.get_active_sources(db)
 
         if not sources:
-            logger.warning(" No active sources found")
+            logger.info(" No sources due for fetching")
             return
 
-        # Run concurrently
-        await asyncio.gather(
-            *[self.fetch_and_process_feed(source) for source in sources],
+        # Fetch with bounded concurrency
+        results = await asyncio.gather(
+            *[self.process_source(source) for source in sources],
             return_exceptions=True,
         )
 
+        fetched_sources = [
+            (source, len(result)) for source, result in zip(sources, results)
+            if isinstance(result, list)
+        ]
+        failed_sources = [
+            source for source, result in zip(sources, results)
+            if not isinstance(result, list)
+        ]
+        pending = [
+            staged for result in results if isinstance(result, list)
+            for staged in result
+        ]
+
+        # Drop cross-feed duplicates, embed every new entry of the cycle in
+        # batches, then drop near-duplicates before any analysis request
+        pending = self.drop_duplicate_keys(pending)
+        embedded = await self.embed_pending_items(pending)
+        staged_items = await self.suppress_near_duplicates(embedded)
+
+        staged_by_source: Dict[int, List[Tuple[NewsItem, str]]] = defaultdict(list)
+        for news_item, raw_text in staged_items:
+            staged_by_source[news_item.source_id].append((news_item, raw_text))
+
+        await self.analyze_pending_items(staged_items)
+
+        await asyncio.gather(
+            *[
+                self.save_source_items(
+                    source,
+                    [news_item for news_item, _ in staged_by_source[source.id]],
+                    new_entries,
+                )
+                for source, new_entries in fetched_sources
+            ]
+        )
+
+        if failed_sources:
+            await self.defer_failed_sources(failed_sources)
+
         logger.info(" Ingestion cycle completed")
+
+    async def reanalyze_items(self):
+        """
+        Re-run AI analysis for recent items that got the fallback analysis
+        (e.g. while the HF circuit was open). Only runs once the circuit
+        has closed, and only on the ingestion leader.
+        """
+        if not hf_circuit.is_closed:
+            logger.info(" HF circuit not closed, re-analysis postponed")
+            return
+
+        async with advisory_leadership(
+            self.session_factory, settings.INGESTION_LOCK_ID
+        ) as leader:
+            if not leader:
+                return
+
+            since = datetime.now(timezone.utc) - timedelta(
+                days=settings.REANALYSIS_WINDOW_DAYS
+            )
+            async with self.session_factory() as db:
+                news_items = await crud.get_items_needing_reanalysis(
+                    db, since, settings.REANALYSIS_BATCH_SIZE
+                )
+            if not news_items:
+                return
+
+            # Items stored before analysis_input existed only have the
+            # truncated fallback summary
+            analyses = await hf_service.analyze_news_batch([
+                (
+                    news_item.title,
+                    news_item.analysis_input or news_item.summary or news_item.title,
+                )
+                for news_item in news_items
+            ])
+
+            # Failures while the circuit opened again are not the item's fault
+            count_attempts = hf_circuit.is_closed
+
+            repaired = []
+            previous_stats = []
+            for news_item, analysis in zip(news_items, analyses):
+                if not analysis.get("needs_reanalysis"):
+                    previous_stats.append(stats_entry(news_item))
+                    apply_analysis(news_item, analysis)
+                    repaired.append(news_item)
+                elif count_attempts:
+                    # e.g. rejected input: give up after a few tries
+                    news_item.reanalysis_attempts += 1
+                    if news_item.reanalysis_attempts >= settings.REANALYSIS_MAX_ATTEMPTS:
+                        news_item.needs_reanalysis = False
+                        news_item.analysis_input = None
+                        logger.warning(
+                            f" Giving up re-analysis: {news_item.title[:60]}"
+                        )
+
+            async with self.session_factory() as db:
+                try:
+                    db.add_all(news_items)
+                    await crud.add_news_stats(
+                        db,
+                        news_stats_deltas(
+                            added=map(stats_entry, repaired),
+                            removed=previous_stats,
+                        ),
+                    )
+                    if repaired:
+                        # Scores and categories changed
+                        await crud.bump_cache_generation(db, "news")
+                        await crud.bump_cache_generation(db, "favorites")
+                    await db.commit()
+                except Exception as save_error:
+                    logger.error(f" Failed to save re-analysis: {save_error}")
+                    await db.rollback()
+                    return
+
+        if not repaired:
+            return
+
+        dashboard_stats.invalidate()
+        logger.info(f" Re-analyzed {len(repaired)} of {len(news_items)} items")
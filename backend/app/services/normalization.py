@@ -0,0 +1,65 @@
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click, never select the article
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref_src", "cmpid", "ncid", "spm", "_hsenc", "_hsmi", "outputtype",
+}
+TRACKING_PREFIXES = ("utm_", "at_")
+
+# AMP variants of an article page
+AMP_HOST_PREFIXES = ("amp.", "m.")
+AMP_PATH_SUFFIXES = ("/amp", ".amp")
+
+# Titles shorter than this are too generic to dedup on
+MIN_FINGERPRINT_WORDS = 4
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL: https, lowercase host without
+    www/amp prefixes, no tracking parameters, fragment or trailing slash.
+    """
+    parts = urlsplit(url.strip())
+
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.",) + AMP_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path)
+    for suffix in AMP_PATH_SUFFIXES:
+        if path.lower().endswith(suffix) or path.lower().endswith(suffix + "/"):
+            path = path.rstrip("/")[: -len(suffix)]
+    path = path.rstrip("/")
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+        and not (key.lower() == "amp")
+    ))
+
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def title_fingerprint(title: str) -> Optional[str]:
+    """
+    Hash of the title with case, accents, punctuation and spacing removed.
+    None for titles too short to identify an article on their own.
+    """
+    text = unicodedata.normalize("NFKD", title)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    words = re.findall(r"[a-z0-9]+", text.lower())
+
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+
+    return hashlib.sha256(" ".join(words).encode()).hexdigest()[:32]
@@ -0,0 +1,91 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import crud
+
+logger = logging.getLogger(__name__)
+
+
+class RecentEmbeddingIndex:
+    """
+    In-memory matrix of normalized embeddings for items from the last
+    SEMANTIC_DEDUP_WINDOW_DAYS, used to spot syndicated copies of a story
+    before paying for analysis. Loaded from the database periodically and
+    extended in between with the items each cycle accepts.
+    """
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self.vectors = np.zeros((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        self.added_at = np.zeros(0, dtype=np.float64)
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def window_seconds(self) -> float:
+        return settings.SEMANTIC_DEDUP_WINDOW_DAYS * 86400
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """
+        Reload from the database when stale, otherwise drop expired rows.
+        """
+        if (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at
+            < settings.SEMANTIC_DEDUP_RELOAD_MINUTES * 60
+        ):
+            self._prune()
+            return
+
+        since = datetime.now(timezone.utc) - timedelta(
+            days=settings.SEMANTIC_DEDUP_WINDOW_DAYS
+        )
+        rows = await crud.get_recent_embeddings(db, since)
+
+        self.titles = [title for title, _, _ in rows]
+        self.vectors = (
+            np.vstack([np.asarray(embedding, dtype=np.float32) for _, embedding, _ in rows])
+            if rows
+            else np.zeros((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        )
+        self.added_at = np.array(
+            [created_at.timestamp() for _, _, created_at in rows], dtype=np.float64
+        )
+        self._loaded_at = time.monotonic()
+        logger.info(f" Semantic dedup index loaded ({len(self.titles)} items)")
+
+    def _prune(self) -> None:
+        keep = self.added_at >= time.time() - self.window_seconds
+        if not keep.all():
+            self.titles = [t for t, k in zip(self.titles, keep) if k]
+            self.vectors = self.vectors[keep]
+            self.added_at = self.added_at[keep]
+
+    def find_duplicate(self, vector: List[float]) -> Optional[Tuple[str, float]]:
+        """
+        Title and similarity of the closest item above the threshold.
+        Vectors are normalized, so the dot product is the cosine.
+        """
+        if not self.titles:
+            return None
+
+        similarities = self.vectors @ np.asarray(vector, dtype=np.float32)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= settings.SEMANTIC_DEDUP_THRESHOLD:
+            return self.titles[best], float(similarities[best])
+        return None
+
+    def add(self, title: str, vector: List[float]) -> None:
+        self.titles.append(title)
+        self.vectors = np.vstack(
+            [self.vectors, np.asarray(vector, dtype=np.float32)[None, :]]
+        )
+        self.added_at = np.append(self.added_at, time.time())
+
+
+recent_embeddings = RecentEmbeddingIndex()
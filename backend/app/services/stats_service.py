@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import crud
+from app.db.models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+# (source_id, category_cluster, impact_score) of one item
+StatsEntry = Tuple[int, str, Optional[int]]
+
+
+def stats_entry(news_item: NewsItem) -> StatsEntry:
+    return (
+        news_item.source_id or 0,
+        news_item.category_cluster or "General",
+        news_item.impact_score,
+    )
+
+
+def news_stats_deltas(
+    added: Iterable[StatsEntry] = (), removed: Iterable[StatsEntry] = ()
+) -> Dict[Tuple[int, str], Tuple[int, int, int]]:
+    """
+    news_stats (item_count, impact_sum, impact_count) changes for items
+    added and removed, keyed by (source_id, category_cluster).
+    """
+    deltas: Dict[Tuple[int, str], list] = {}
+    for entries, sign in ((added, 1), (removed, -1)):
+        for source_id, category, impact_score in entries:
+            delta = deltas.setdefault((source_id, category), [0, 0, 0])
+            delta[0] += sign
+            if impact_score is not None:
+                delta[1] += sign * impact_score
+                delta[2] += sign
+    return {
+        key: tuple(delta) for key, delta in deltas.items() if any(delta)
+    }
+
+
+class DashboardStats:
+    """
+    Dashboard statistics read from the news_stats summary table, which
+    ingestion and re-analysis update in the transactions that change the
+    items. Every worker reads the same rows; the copy here is only reused
+    for STATS_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+        self.total_news = 0
+        self.impact_sum = 0
+        self.impact_count = 0
+        self.total_sources = 0
+        self.by_category: Counter = Counter()
+        self.by_source: Counter = Counter()
+        self.source_names: Dict[int, str] = {}
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > settings.STATS_REFRESH_SECONDS
+        )
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def load(self, db: AsyncSession) -> None:
+        grouped, sources = await crud.get_news_stats(db)
+
+        self.source_names = {source_id: name for source_id, name, _ in sources}
+        self.total_sources = sum(1 for _, _, is_active in sources if is_active)
+
+        self.total_news = 0
+        self.impact_sum = 0
+        self.impact_count = 0
+        self.by_category = Counter()
+        self.by_source = Counter()
+
+        for source_id, category, count, impact_sum, impact_count in grouped:
+            self.total_news += count
+            self.impact_sum += int(impact_sum)
+            self.impact_count += impact_count
+            self.by_category[category or "General"] += count
+            self.by_source[source_id] += count
+
+        self._loaded_at = time.monotonic()
+
+    async def get(self, db: AsyncSession) -> Dict[str, Any]:
+        if self.is_stale:
+            async with self._lock:
+                if self.is_stale:
+                    await self.load(db)
+
+        avg_impact = (
+            self.impact_sum / self.impact_count if self.impact_count else 0
+        )
+        return {
+            "total_news": self.total_news,
+            "total_sources": self.total_sources,
+            "avg_impact_score": round(avg_impact, 2),
+            "by_category": dict(self.by_category.most_common()),
+            "by_source": {
+                self.source_names.get(source_id, "Unknown"): count
+                for source_id, count in self.by_source.most_common()
+            },
+        }
+
+
+dashboard_stats = DashboardStats()
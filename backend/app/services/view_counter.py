@@ -0,0 +1,64 @@
+import logging
+from collections import Counter
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounterBuffer:
+    """
+    Write-behind buffer for article view counts.
+
+    Views are counted in memory and flushed periodically as a single
+    batched UPDATE, so reading an article never opens a write transaction.
+    """
+
+    def __init__(self):
+        self._pending: Counter = Counter()
+
+    def record(self, news_id: int) -> None:
+        self._pending[news_id] += 1
+
+    @property
+    def pending(self) -> int:
+        return sum(self._pending.values())
+
+    async def flush(self) -> int:
+        """
+        Apply buffered increments. Returns the number of rows updated.
+        """
+        if not self._pending:
+            return 0
+
+        # Swap before awaiting so views recorded meanwhile go to the next flush
+        pending, self._pending = self._pending, Counter()
+
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    text(
+                        "UPDATE news_items AS n "
+                        "SET view_count = COALESCE(n.view_count, 0) + d.delta "
+                        "FROM unnest(CAST(:ids AS integer[]), CAST(:deltas AS integer[])) "
+                        "AS d(id, delta) "
+                        "WHERE n.id = d.id"
+                    ),
+                    {
+                        "ids": list(pending.keys()),
+                        "deltas": list(pending.values()),
+                    },
+                )
+                await db.commit()
+                return result.rowcount
+
+        except Exception as e:
+            logger.error(f"View count flush failed: {e}")
+            # Keep the increments for the next attempt
+            self._pending.update(pending)
+            return 0
+
+
+view_counter = ViewCounterBuffer()
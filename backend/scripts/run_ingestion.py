@@ -6,24 +6,24 @@ import sys
 sys.path.append('/app')
 
 import asyncio
-from app.core.database import SessionLocal
 from app.services.ingestion_service import IngestionService
+from app.services.huggingface_service import hf_service
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def run_ingestion():
-    db = SessionLocal()
     try:
         logger.info(" Starting manual ingestion...")
-        service = IngestionService(db)
-        await service.run_ingestion_cycle()
+        service = IngestionService()
+        # Manual runs ignore the per-source schedule
+        await service.run_ingestion_cycle(due_only=False)
         logger.info(" Ingestion complete!")
     except Exception as e:
         logger.error(f" Ingestion failed: {e}")
     finally:
-        db.close()
+        await hf_service.aclose()
 
 if __name__ == "__main__":
     asyncio.run(run_ingestion())
\ No newline at end of file
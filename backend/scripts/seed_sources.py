@@ -1,7 +1,8 @@
 import sys
 sys.path.append('/app')
 
-from app.core.database import SessionLocal
+import asyncio
+from app.core.database import AsyncSessionLocal, async_engine
 from app.db import crud
 import logging
 
@@ -31,14 +32,14 @@ INITIAL_SOURCES = [
     ("Towards Data Science AI", "https://towardsdatascience.com/feed/tagged/artificial-intelligence"),
 ]
 
-def seed_sources():
-    db = SessionLocal()
+async def seed_sources():
+    db = AsyncSessionLocal()
     try:
         logger.info(" Starting source seeding...")
         
         for name, url in INITIAL_SOURCES:
             try:
-                source = crud.create_source(db, name, url)
+                source = await crud.create_source(db, name, url)
                 logger.info(f"✓ {name}")
             except Exception as e:
                 logger.error(f"✗ {name}: {e}")
@@ -48,7 +49,8 @@ def seed_sources():
     except Exception as e:
         logger.error(f" Seeding failed: {e}")
     finally:
-        db.close()
+        await db.close()
+        await async_engine.dispose()
 
 if __name__ == "__main__":
-    seed_sources()
\ No newline at end of file
+    asyncio.run(seed_sources())
\ No newline at end of file
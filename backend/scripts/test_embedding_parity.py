@@ -0,0 +1,52 @@
+"""
+Check that the ONNX embedding backends agree with the torch path.
+Run before switching EMBEDDING_BACKEND in production.
+"""
+import sys
+sys.path.append('/app')
+
+import numpy as np
+from app.core.config import settings
+from app.services.embedding_backends import create_embedding_backend
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAMPLE_TEXTS = [
+    "OpenAI releases GPT-5 with revolutionary capabilities",
+    "Google DeepMind publishes a new paper on protein structure prediction.",
+    "EU lawmakers agree on final text of the AI Act after marathon talks",
+    "Startup raises $50M to build AI chips for edge devices",
+    "Hugging Face adds new open-weight models to its hub. The release "
+    "includes several small language models tuned for on-device inference.",
+    "Short",
+]
+
+# Minimum cosine similarity to the torch vectors for each backend
+THRESHOLDS = {
+    "onnx": 0.999,
+    "onnx-int8": 0.97,
+}
+
+def test_parity():
+    model_name = settings.HUGGINGFACE_EMBEDDING_MODEL
+    logger.info(f" Reference: torch ({model_name})")
+    reference = create_embedding_backend("torch", model_name).encode(SAMPLE_TEXTS)
+
+    passed = True
+    for backend, threshold in THRESHOLDS.items():
+        vectors = create_embedding_backend(backend, model_name).encode(SAMPLE_TEXTS)
+        cosines = (reference * vectors).sum(axis=1)
+
+        ok = bool(np.all(cosines >= threshold))
+        passed = passed and ok
+        logger.info(
+            f" {'✓' if ok else '✗'} {backend}: min cosine {cosines.min():.5f}, "
+            f"mean {cosines.mean():.5f} (threshold {threshold})"
+        )
+
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if test_parity() else 1)
@@ -44,6 +44,7 @@ async def test_service():
         logger.error(" Analysis failed")
     
     logger.info("\n All tests completed!")
+    await hf_service.aclose()
 
 if __name__ == "__main__":
     asyncio.run(test_service())
\ No newline at end of file
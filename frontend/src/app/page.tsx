@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import {
   fetchNews,
   searchNews,
@@ -17,6 +17,9 @@ export default function Dashboard() {
   const [news, setNews] = useState<NewsItem[]>([]);
   const [query, setQuery] = useState("");
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const sentinelRef = useRef<HTMLDivElement>(null);
   const [stats, setStats] = useState<DashboardStats>({
     total_news: 0,
     total_sources: 0,
@@ -30,11 +33,12 @@ export default function Dashboard() {
   const loadNews = async () => {
     setLoading(true);
     try {
-      const [newsData, statsData] = await Promise.all([
+      const [newsPage, statsData] = await Promise.all([
         fetchNews(),
         getDashboardStats(),
       ]);
-      setNews(newsData);
+      setNews(newsPage.items);
+      setNextCursor(newsPage.next_cursor);
       setStats(statsData);
     } catch (e) {
       console.error(e);
@@ -46,14 +50,48 @@ export default function Dashboard() {
     e.preventDefault();
     setLoading(true);
     try {
-      const data = query ? await searchNews(query) : await fetchNews();
-      setNews(data);
+      if (query) {
+        setNews(await searchNews(query));
+        setNextCursor(null);
+      } else {
+        const newsPage = await fetchNews();
+        setNews(newsPage.items);
+        setNextCursor(newsPage.next_cursor);
+      }
     } catch (e) {
       console.error(e);
     }
     setLoading(false);
   };
 
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const newsPage = await fetchNews(0, undefined, nextCursor);
+      setNews((prev) => [...prev, ...newsPage.items]);
+      setNextCursor(newsPage.next_cursor);
+    } catch (e) {
+      console.error(e);
+    }
+    setLoadingMore(false);
+  }, [nextCursor, loadingMore]);
+
+  // Infinite scroll: fetch the next page when the sentinel comes into view
+  useEffect(() => {
+    const sentinel = sentinelRef.current;
+    if (!sentinel || !nextCursor) return;
+
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries[0].isIntersecting) loadMore();
+      },
+      { rootMargin: "400px" }
+    );
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [nextCursor, loadMore]);
+
   return (
     <div className="flex min-h-screen bg-slate-50">
       <Sidebar />
@@ -127,11 +165,21 @@ export default function Dashboard() {
             <p>No news found matching your criteria.</p>
           </div>
         ) : (
-          <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-3 gap-6 pb-10">
-            {news.map((item) => (
-              <NewsCard key={item.id} item={item} />
-            ))}
-          </div>
+          <>
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-3 gap-6 pb-10">
+              {news.map((item) => (
+                <NewsCard key={item.id} item={item} />
+              ))}
+            </div>
+            {nextCursor && (
+              <div
+                ref={sentinelRef}
+                className="flex justify-center py-6 text-gray-400"
+              >
+                {loadingMore && <RefreshCw className="animate-spin" size={24} />}
+              </div>
+            )}
+          </>
         )}
       </main>
     </div>
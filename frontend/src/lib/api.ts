@@ -19,9 +19,20 @@ export interface DashboardStats {
   total_news: number;
   total_sources: number;
   avg_impact_score: number;
+  by_category?: Record<string, number>;
+  by_source?: Record<string, number>;
 }
 
-export async function fetchNews(minImpact: number = 0, category?: string) {
+export interface NewsPage {
+  items: NewsItem[];
+  next_cursor: string | null;
+}
+
+export async function fetchNews(
+  minImpact: number = 0,
+  category?: string,
+  cursor?: string | null
+): Promise<NewsPage> {
   try {
     const params = new URLSearchParams({
       min_impact: minImpact.toString(),
@@ -32,15 +43,19 @@ export async function fetchNews(minImpact: number = 0, category?: string) {
       params.append("category", category);
     }
 
+    if (cursor) {
+      params.append("cursor", cursor);
+    }
+
     const res = await fetch(`${API_URL}/news/?${params}`, {
-      cache: "no-store",
+      cache: "no-cache",
     });
 
     if (!res.ok) throw new Error(`Error fetching news: ${res.statusText}`);
     return await res.json();
   } catch (error) {
     console.error("Fetch News Error:", error);
-    return [];
+    return { items: [], next_cursor: null };
   }
 }
 
@@ -49,7 +64,7 @@ export async function searchNews(query: string) {
     const res = await fetch(`${API_URL}/news/search`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ query, limit: 20 }),
+      body: JSON.stringify({ query, limit: 20, mode: "hybrid" }),
     });
     if (!res.ok) throw new Error("Search failed");
     return await res.json();
@@ -78,7 +93,7 @@ export async function toggleFavorite(id: number) {
 export async function getFavorites() {
   try {
     const res = await fetch(`${API_URL}/news/favorites`, {
-      cache: "no-store",
+      cache: "no-cache",
     });
     if (!res.ok) throw new Error("Failed to fetch favorites");
     return await res.json();
@@ -91,7 +106,7 @@ export async function getFavorites() {
 export async function getCategories() {
   try {
     const res = await fetch(`${API_URL}/news/categories/list`, {
-      cache: "no-store",
+      cache: "no-cache",
     });
     if (!res.ok) throw new Error("Failed to fetch categories");
     return await res.json();
@@ -104,7 +119,7 @@ export async function getCategories() {
 export async function getDashboardStats(): Promise<DashboardStats> {
   try {
     const res = await fetch(`${API_URL}/news/stats/dashboard`, {
-      cache: "no-store",
+      cache: "no-cache",
     });
     if (!res.ok) throw new Error("Failed to fetch stats");
     return await res.json();